@@ -0,0 +1,74 @@
+"""Benchmark `find_assets` lookups in an asset index filled up to `ASSET_CACHE_MAX_ENTRIES`.
+
+Assets are synthetic, with random symbols and two-word names, plus a few real ones to look up.
+
+Run:
+python -m benchmarks.bench_asset_index --assets 20000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from bp_mcp.asset_index import AssetIndex
+from bp_mcp.schemas import AssetData
+
+KNOWN_ASSETS = [
+    AssetData(id="ea8962d5-edee-11eb-9bf0-06502b1fe55d", name="Bitcoin", symbol="BTC"),
+    AssetData(id="ea8a0a0e-edee-11eb-9bf0-06502b1fe55d", name="Ethereum", symbol="ETH"),
+]
+# Exact symbol, exact name, short and long prefixes, typo and miss
+QUERIES = [
+    "BTC",
+    "bitcoin",
+    "Ethereum",
+    "b",
+    "e",
+    "x",
+    "bi",
+    "et",
+    "ether",
+    "etherium",
+    "bitcoinn",
+    "qqqqzzzz",
+]
+
+
+def random_word(rng: random.Random, min_length: int, max_length: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(min_length, max_length)))
+
+
+def make_index(assets: int, seed: int = 1) -> AssetIndex:
+    rng = random.Random(seed)  # noqa: S311
+    index = AssetIndex()
+    index.add_many(
+        AssetData(
+            id=f"asset-{i}",
+            name=f"{random_word(rng, 4, 10).title()} {random_word(rng, 3, 8).title()}",
+            symbol=random_word(rng, 2, 5).upper(),
+        )
+        for i in range(assets)
+    )
+    index.add_many(KNOWN_ASSETS)
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    index = make_index(args.assets)
+    print(f"{'query':>10} {'us/lookup':>10}  best match")
+    for query in QUERIES:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            found = index.search(query)
+        elapsed_us = (time.perf_counter() - started) / args.repeat * 1e6
+        print(f"{query:>10} {elapsed_us:>10.1f}  {found[0].name if found else '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark bytes-on-wire and CPU cost of response compression per page size.
+
+Pages are synthetic `TransactionResponse` documents shaped like the Bitpanda API ones.
+
+Run:
+python -m benchmarks.bench_compression
+"""
+
+import argparse
+import gzip
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from bp_mcp.compression import ENCODERS, brotli, zstandard
+from bp_mcp.schemas import TransactionResponse
+
+DECODERS: dict[str, Callable[[bytes], bytes]] = {"gzip": gzip.decompress}
+if brotli:
+    DECODERS["br"] = brotli.decompress
+if zstandard:
+    DECODERS["zstd"] = zstandard.ZstdDecompressor().decompress
+
+
+def make_page(page_size: int) -> bytes:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    account_id = str(uuid.uuid4())
+    wallet_id = str(uuid.uuid4())
+    transactions = [
+        {
+            "transaction_id": str(uuid.uuid4()),
+            "operation_id": str(uuid.uuid4()),
+            "asset_id": "ea8962d5-edee-11eb-9bf0-06502b1fe55d",
+            "account_id": account_id,
+            "wallet_id": wallet_id,
+            "asset_amount": 0.00123456 * (i + 1),
+            "fee_amount": 0.0000123 * (i + 1),
+            "operation_type": "buy" if i % 3 else "sell",
+            "transaction_type": "trade",
+            "flow": "INCOMING" if i % 2 else "OUTGOING",
+            "credited_at": (start + timedelta(minutes=37 * i)).isoformat(),
+            "trade_id": str(uuid.uuid4()),
+        }
+        for i in range(page_size)
+    ]
+    page = TransactionResponse.model_validate(
+        {
+            "start_cursor": str(uuid.uuid4()),
+            "end_cursor": str(uuid.uuid4()),
+            "has_previous_page": False,
+            "has_next_page": True,
+            "page_size": page_size,
+            "data": transactions,
+        }
+    )
+    return page.model_dump_json().encode()
+
+
+def timed(func: Callable[[], bytes], rounds: int) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    return result, (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[1, 10, 25, 50, 100])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    columns = ("items", "encoding", "level", "bytes", "ratio", "encode µs", "decode µs")
+    widths = (5, 8, 5, 8, 6, 10, 10)
+    print(" ".join(f"{column:>{width}}" for column, width in zip(columns, widths, strict=True)))
+    for page_size in args.page_sizes:
+        body = make_page(page_size)
+        print(f"{page_size:>5} {'identity':>8} {'-':>5} {len(body):>8} {1:>6.2f} {'-':>10} {'-':>10}")
+        for encoding, encode in ENCODERS.items():
+            for level in args.levels:
+                compressed, encode_s = timed(lambda: encode(body, level), args.rounds)  # noqa: B023
+                decoded, decode_s = timed(lambda: DECODERS[encoding](compressed), args.rounds)  # noqa: B023
+                assert decoded == body  # noqa: S101
+                print(
+                    f"{page_size:>5} {encoding:>8} {level:>5} {len(compressed):>8} "
+                    f"{len(body) / len(compressed):>6.2f} {encode_s * 1e6:>10.1f} {decode_s * 1e6:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark MCP tool call throughput over HTTP for different server worker counts.
+
+Every configuration runs the real server against a local stub upstream. Tool calls are plain
+JSON-RPC posts from `--concurrency` clients, each with its own MCP session, over keep-alive connections.
+
+Run:
+python -m benchmarks.bench_throughput --workers 1 2 4 --concurrency 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Any
+
+import httpx
+
+from benchmarks.servers import API_KEY, mcp_http_server, stub_upstream
+from benchmarks.stub_upstream import ASSET_ID
+
+TOOL_ARGUMENTS: dict[str, dict[str, Any]] = {
+    "find_assets": {"query": "btc"},
+    "get_asset": {"asset_id": ASSET_ID},
+    "get_transactions": {"page_size": 100},
+}
+HEADERS = {"Accept": "application/json, text/event-stream", "X-Api-Key": API_KEY}
+
+
+async def open_session(client: httpx.AsyncClient, mcp_url: str) -> dict[str, str]:
+    """Initialize an MCP session. Return the headers for its requests (none when the server is stateless)."""
+    initialize = {
+        "jsonrpc": "2.0",
+        "id": 0,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {},
+            "clientInfo": {"name": "bench_throughput", "version": "0"},
+        },
+    }
+    response = await client.post(mcp_url, json=initialize)
+    response.raise_for_status()
+    session_id = response.headers.get("mcp-session-id")
+    headers = {"mcp-session-id": session_id} if session_id else {}
+    initialized = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+    (await client.post(mcp_url, json=initialized, headers=headers)).raise_for_status()
+    return headers
+
+
+async def run_load(mcp_url: str, tool: str, concurrency: int, duration_s: float) -> tuple[list[float], int]:
+    """Call `tool` from `concurrency` clients for `duration_s`. Return latencies of successes and errors."""
+    latencies: list[float] = []
+    errors = 0
+    ids = itertools.count()
+    deadline = time.perf_counter() + duration_s
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            session_headers = await open_session(client, mcp_url)
+            while time.perf_counter() < deadline:
+                body = {
+                    "jsonrpc": "2.0",
+                    "id": next(ids),
+                    "method": "tools/call",
+                    "params": {"name": tool, "arguments": TOOL_ARGUMENTS[tool]},
+                }
+                started = time.perf_counter()
+                try:
+                    response = await client.post(mcp_url, json=body, headers=session_headers)
+                    ok = response.status_code == httpx.codes.OK and "error" not in response.json()
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def report(workers: int, tool: str, latencies: list[float], errors: int, duration_s: float) -> None:
+    ms = sorted(latency * 1000 for latency in latencies) or [0.0]
+    p50, p99 = (ms[min(len(ms) - 1, int(len(ms) * q))] for q in (0.5, 0.99))
+    print(f"{workers:>7} {tool:>16} {len(latencies) / duration_s:>9.1f} {p50:>9.2f} {p99:>9.2f} {errors:>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="SERVER_WORKERS values")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per configuration")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of load before measuring")
+    parser.add_argument("--tools", nargs="+", choices=list(TOOL_ARGUMENTS), default=["get_asset"])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated upstream latency")
+    parser.add_argument("--loop", default="auto", help="SERVER_LOOP: auto, asyncio or uvloop")
+    parser.add_argument("--http", default="auto", help="SERVER_HTTP: auto, h11 or httptools")
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'tool':>16} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    with stub_upstream(args.latency_ms) as upstream_url:
+        for workers in args.workers:
+            server = mcp_http_server(
+                upstream_url,
+                SERVER_WORKERS=str(workers),
+                SERVER_LOOP=args.loop,
+                SERVER_HTTP=args.http,
+                # Measure the server, not admission control
+                MAX_IN_FLIGHT_REQUESTS=str(max(64, args.concurrency)),
+            )
+            with server as mcp_url:
+                for tool in args.tools:
+                    asyncio.run(run_load(mcp_url, tool, args.concurrency, args.warmup))
+                    latencies, errors = asyncio.run(run_load(mcp_url, tool, args.concurrency, args.duration))
+                    report(workers, tool, latencies, errors, args.duration)
+
+
+if __name__ == "__main__":
+    main()
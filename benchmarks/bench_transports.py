@@ -0,0 +1,77 @@
+"""Benchmark per-call latency of MCP tool calls over the stdio and streamable HTTP transports.
+
+Both transports run the real server against a local stub upstream.
+
+Run:
+python -m benchmarks.bench_transports --calls 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from fastmcp import Client
+from fastmcp.client.transports import ClientTransport, StdioTransport, StreamableHttpTransport
+
+from benchmarks.servers import API_KEY, mcp_http_server, server_env, stub_upstream
+from benchmarks.stub_upstream import ASSET_ID
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+TOOL_ARGUMENTS: dict[str, dict[str, Any]] = {
+    "find_assets": {"query": "btc"},
+    "get_asset": {"asset_id": ASSET_ID},
+    "get_transactions": {"page_size": 100},
+}
+
+
+async def measure(transport: ClientTransport, tool: str, calls: int, warmup: int) -> list[float]:
+    latencies = []
+    async with Client(transport) as client:
+        for i in range(warmup + calls):
+            started = time.perf_counter()
+            await client.call_tool(tool, TOOL_ARGUMENTS[tool])
+            if i >= warmup:
+                latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def report(transport: str, tool: str, latencies: list[float]) -> None:
+    ms = sorted(latency * 1000 for latency in latencies)
+    p50, p95, p99 = (ms[min(len(ms) - 1, int(len(ms) * q))] for q in (0.5, 0.95, 0.99))
+    print(
+        f"{transport:>6} {tool:>16} {len(ms):>6} {statistics.mean(ms):>9.2f} "
+        f"{p50:>9.2f} {p95:>9.2f} {p99:>9.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--tools", nargs="+", choices=list(TOOL_ARGUMENTS), default=list(TOOL_ARGUMENTS))
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated upstream latency")
+    args = parser.parse_args()
+
+    print(f"{'mode':>6} {'tool':>16} {'calls':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    with stub_upstream(args.latency_ms) as upstream_url, mcp_http_server(upstream_url) as mcp_url:
+        transports: dict[str, Callable[[], ClientTransport]] = {
+            "stdio": lambda: StdioTransport(
+                sys.executable,
+                ["-m", "bp_mcp.bitpanda_mcp_server", "--transport", "stdio"],
+                env=server_env(upstream_url),
+            ),
+            "http": lambda: StreamableHttpTransport(mcp_url, headers={"X-Api-Key": API_KEY}),
+        }
+        for tool in args.tools:
+            for name, transport in transports.items():
+                latencies = asyncio.run(measure(transport(), tool, args.calls, args.warmup))
+                report(name, tool, latencies)
+
+
+if __name__ == "__main__":
+    main()
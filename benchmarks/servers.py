@@ -0,0 +1,72 @@
+"""Helpers starting the stub upstream and the MCP server as subprocesses for benchmarks."""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+API_KEY = "benchmark"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def wait_for_port(port: int, timeout_s: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise TimeoutError(f"Nothing listening on port {port} after {timeout_s}s")
+
+
+def server_env(upstream_url: str, **extra: str) -> dict[str, str]:
+    """Environment for the MCP server, pointed at the stub upstream."""
+    return {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "BITPANDA_BASE_URL": upstream_url,
+        "BITPANDA_API_KEY": API_KEY,
+        "SERVER_HOST": "127.0.0.1",
+        **extra,
+    }
+
+
+@contextmanager
+def run_process(args: list[str], env: dict[str, str], port: int) -> Iterator[None]:
+    process = subprocess.Popen(  # noqa: S603
+        [sys.executable, *args], env=env, cwd=ROOT, stdout=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(port)
+        yield
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@contextmanager
+def stub_upstream(latency_ms: float = 0.0) -> Iterator[str]:
+    """Run the stub upstream and yield its base URL."""
+    port = free_port()
+    args = ["-m", "benchmarks.stub_upstream", "--port", str(port), "--latency-ms", str(latency_ms)]
+    with run_process(args, {**os.environ, "PYTHONPATH": str(ROOT)}, port):
+        yield f"http://127.0.0.1:{port}"
+
+
+@contextmanager
+def mcp_http_server(upstream_url: str, args: list[str] | None = None, **env: str) -> Iterator[str]:
+    """Run the MCP server over HTTP and yield its MCP endpoint URL."""
+    port = free_port()
+    server_args = ["-m", "bp_mcp.bitpanda_mcp_server", "--transport", "http", *(args or [])]
+    with run_process(server_args, server_env(upstream_url, SERVER_PORT=str(port), **env), port):
+        yield f"http://127.0.0.1:{port}/mcp"
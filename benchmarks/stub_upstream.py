@@ -0,0 +1,92 @@
+"""Local stand-in for the Bitpanda Developer API, serving synthetic data for benchmarks.
+
+Run:
+python -m benchmarks.stub_upstream --port 8901 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Annotated, Any
+
+import uvicorn
+from fastapi import FastAPI, Query
+
+ASSET_ID = "ea8962d5-edee-11eb-9bf0-06502b1fe55d"
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def create_app(latency_ms: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Bitpanda Developer API stub")
+
+    async def simulate_latency() -> None:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    @app.get("/v1/assets/{asset_id}")
+    async def get_asset(asset_id: str) -> dict[str, Any]:
+        await simulate_latency()
+        return {"data": {"id": asset_id, "name": "Bitcoin", "symbol": "BTC"}}
+
+    @app.get("/v1/transactions")
+    async def get_transactions(
+        wallet_id: str | None = None,
+        after: str | None = None,
+        page_size: Annotated[int, Query(ge=1, le=100)] = 25,
+    ) -> dict[str, Any]:
+        await simulate_latency()
+        start = int(after or 0)
+        wallet_id = wallet_id or str(uuid.uuid5(uuid.NAMESPACE_OID, "wallet"))
+        data = [
+            {
+                "transaction_id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"{wallet_id}-{i}")),
+                "operation_id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"op-{wallet_id}-{i}")),
+                "asset_id": ASSET_ID,
+                "account_id": str(uuid.uuid5(uuid.NAMESPACE_OID, "account")),
+                "wallet_id": wallet_id,
+                "asset_amount": 0.001 * (i + 1),
+                "fee_amount": 0.00001,
+                "operation_type": "buy",
+                "transaction_type": "trade",
+                "flow": "INCOMING",
+                "credited_at": (START - timedelta(minutes=17 * i)).isoformat(),
+            }
+            for i in range(start, start + page_size)
+        ]
+        return {
+            "start_cursor": str(start),
+            "end_cursor": str(start + page_size),
+            "has_previous_page": start > 0,
+            "has_next_page": True,
+            "page_size": page_size,
+            "data": data,
+        }
+
+    @app.get("/v1/wallets/")
+    async def get_wallets(page_size: Annotated[int, Query(ge=1, le=100)] = 25) -> dict[str, Any]:
+        await simulate_latency()
+        data = [
+            {
+                "wallet_id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"wallet-{i}")),
+                "asset_id": ASSET_ID,
+                "last_credited_at": START.isoformat(),
+                "balance": 1.5 * i,
+            }
+            for i in range(page_size)
+        ]
+        return {"has_previous_page": False, "has_next_page": False, "page_size": page_size, "data": data}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bitpanda Developer API stub")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated upstream latency")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from bp_mcp.exception_handlers import error_response
+from bp_mcp.schemas import AdmissionStats, Settings
+
+LOGGER = logging.getLogger(__name__)
+
+# Paths that never wait for a slot (health probes must answer under overload)
+EXEMPT_PATHS = frozenset({"/healthz"})
+# Cheap MCP tools that are admitted ahead of queued requests
+PRIORITY_TOOLS = frozenset({"get_asset", "find_assets"})
+# Tool calls are small, larger request bodies are not inspected for priority
+MAX_INSPECTED_BODY_BYTES = 4096
+
+
+class OverloadedError(Exception):
+    """Raised when a request can't be admitted."""
+
+
+class AdmissionController:
+    """Limit concurrent requests and keep a bounded wait queue for the rest.
+
+    At most `max_in_flight` requests run at once. Up to `max_queued` more wait for a free slot
+    (priority requests first) for at most `queue_timeout_s` seconds. Anything beyond is rejected.
+    """
+
+    def __init__(self, max_in_flight: int, max_queued: int, queue_timeout_s: float) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout_s = queue_timeout_s
+        self.in_flight = 0
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self._queue_wait_total_s = 0.0
+        self._queue_wait_max_s = 0.0
+        self._queued_total = 0
+        self._priority_waiters: deque[asyncio.Future[None]] = deque()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._priority_waiters) + len(self._waiters)
+
+    async def acquire(self, priority: bool = False) -> None:
+        if self.in_flight < self.max_in_flight and not self.queued:
+            self.in_flight += 1
+            self.admitted_total += 1
+            return
+        if self.queued >= self.max_queued:
+            self.rejected_total += 1
+            raise OverloadedError("Too many queued requests")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiters = self._priority_waiters if priority else self._waiters
+        waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.queue_timeout_s):
+                await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over while we were giving up, pass it on
+                self.release()
+            elif waiter in waiters:
+                # release() may already have dropped it, if it ran before this task resumed
+                waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                self.rejected_total += 1
+                raise OverloadedError("Timed out waiting for a free slot") from exc
+            raise
+        self._record_wait(time.perf_counter() - started)
+        self.admitted_total += 1
+
+    def release(self) -> None:
+        # Hand the slot over to the next waiter, if any, instead of freeing it
+        for waiters in (self._priority_waiters, self._waiters):
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            in_flight=self.in_flight,
+            queued=self.queued,
+            max_in_flight=self.max_in_flight,
+            max_queued=self.max_queued,
+            admitted_total=self.admitted_total,
+            rejected_total=self.rejected_total,
+            queue_wait_avg_ms=round(self._queue_wait_total_s / self._queued_total * 1000, 3)
+            if self._queued_total
+            else 0.0,
+            queue_wait_max_ms=round(self._queue_wait_max_s * 1000, 3),
+        )
+
+    def _record_wait(self, wait_s: float) -> None:
+        self._queued_total += 1
+        self._queue_wait_total_s += wait_s
+        self._queue_wait_max_s = max(self._queue_wait_max_s, wait_s)
+
+
+def build_admission_controller(settings: Settings) -> AdmissionController:
+    return AdmissionController(
+        max_in_flight=settings.max_in_flight_requests,
+        max_queued=settings.max_queued_requests,
+        queue_timeout_s=settings.admission_queue_timeout_s,
+    )
+
+
+def is_priority_tool_call(body: bytes) -> bool:
+    """Return whether `body` is a JSON-RPC call of one of the `PRIORITY_TOOLS`."""
+    try:
+        request = json.loads(body)
+    except ValueError:
+        return False
+    return (
+        isinstance(request, dict)
+        and request.get("method") == "tools/call"
+        and isinstance(request.get("params"), dict)
+        and request["params"].get("name") in PRIORITY_TOOLS
+    )
+
+
+async def _peek_body(receive: Receive) -> tuple[Receive, bytes | None]:
+    """Read the request body up to `MAX_INSPECTED_BODY_BYTES`.
+
+    Return a `receive` replaying what was read, and the body, or None if it was too large to inspect.
+    """
+    messages: list[Message] = []
+    size = 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        size += len(message.get("body", b""))
+        if size > MAX_INSPECTED_BODY_BYTES or not message.get("more_body", False):
+            break
+
+    body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.request")
+    buffered = iter(messages)
+
+    async def replay() -> Message:
+        return next(buffered, None) or await receive()
+
+    return replay, body if size <= MAX_INSPECTED_BODY_BYTES else None
+
+
+class AdmissionMiddleware:
+    """ASGI middleware shedding load with a fast `503` once the admission controller is saturated.
+
+    It wraps the MCP HTTP app, so requests are limited before any JSON-RPC processing. Long-lived
+    event streams (`GET` with `Accept: text/event-stream`) don't take a slot.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController, retry_after_s: int) -> None:
+        self.app = app
+        self.controller = controller
+        self.retry_after_s = retry_after_s
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path in EXEMPT_PATHS or self._is_event_stream(scope):
+            await self.app(scope, receive, send)
+            return
+
+        priority = False
+        if scope["method"] == "POST":
+            receive, body = await _peek_body(receive)
+            priority = body is not None and is_priority_tool_call(body)
+
+        try:
+            await self.controller.acquire(priority=priority)
+        except OverloadedError as err:
+            LOGGER.warning("Rejected %s: %s", path, err)
+            response = error_response(
+                status_code=503,
+                error="Service Unavailable",
+                message=f"Server overloaded: {err}. Retry later.",
+                headers={"Retry-After": str(self.retry_after_s)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+    @staticmethod
+    def _is_event_stream(scope: Scope) -> bool:
+        return scope["method"] == "GET" and "text/event-stream" in Headers(scope=scope).get("accept", "")
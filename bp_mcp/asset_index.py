@@ -0,0 +1,191 @@
+import asyncio
+import bisect
+import difflib
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from bp_mcp.cache import TTLCache, get_cache
+from bp_mcp.schemas import AssetData, Settings
+
+LOGGER = logging.getLogger(__name__)
+
+# Match ranks, lower is better
+SYMBOL, NAME, NAME_WORD = 0, 1, 2
+EXACT, PREFIX, FUZZY = 0, 3, 6
+
+FUZZY_CUTOFF = 0.75
+# Prefix and fuzzy matching are Python loops over terms, these bound them to a fraction of a millisecond.
+# Short prefixes match thousands of terms, only the first ones in sort order are considered.
+MAX_PREFIX_TERMS = 200
+MAX_FUZZY_CANDIDATES = 50
+MAX_FUZZY_SCAN = 500
+
+
+class AssetIndex:
+    """In-memory lookup of assets by symbol or name.
+
+    Symbols, names and the words of names are kept as lowercase terms in a sorted list, so exact and
+    prefix lookups are a dict hit or a bisect. Fuzzy matching is only used when those find nothing, over
+    a bounded set of candidate terms.
+    """
+
+    def __init__(self) -> None:
+        self._assets: dict[str, AssetData] = {}
+        self._terms: dict[str, set[tuple[int, str]]] = {}
+        self._sorted_terms: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def clear(self) -> None:
+        self._assets.clear()
+        self._terms.clear()
+        self._sorted_terms.clear()
+
+    def add(self, asset: AssetData) -> None:
+        known = self._assets.get(asset.id)
+        if known == asset:
+            return
+        if known is not None:
+            self._remove_terms(known)
+        self._assets[asset.id] = asset
+        for term, field in self._asset_terms(asset):
+            if term not in self._terms:
+                self._terms[term] = set()
+                bisect.insort(self._sorted_terms, term)
+            self._terms[term].add((field, asset.id))
+
+    def add_many(self, assets: Iterable[AssetData]) -> None:
+        for asset in assets:
+            self.add(asset)
+
+    def search(self, query: str, limit: int = 10) -> list[AssetData]:
+        """Return known assets matching `query` by symbol or name, best matches first."""
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        ranks: dict[str, int] = {}
+
+        def match(term: str, kind: int) -> None:
+            for field, asset_id in self._terms[term]:
+                rank = kind + field
+                if rank < ranks.get(asset_id, FUZZY + NAME_WORD + 1):
+                    ranks[asset_id] = rank
+
+        if query in self._terms:
+            match(query, EXACT)
+        for term in self._prefixed_terms(query):
+            match(term, PREFIX)
+        if not ranks:
+            candidates = self._fuzzy_candidates(query)
+            for term in difflib.get_close_matches(query, candidates, n=limit, cutoff=FUZZY_CUTOFF):
+                match(term, FUZZY)
+
+        # Ties go to the closest (shortest) name
+        best = sorted(
+            ranks,
+            key=lambda asset_id: (
+                ranks[asset_id],
+                len(self._assets[asset_id].name),
+                self._assets[asset_id].symbol,
+            ),
+        )
+        return [self._assets[asset_id] for asset_id in best[:limit]]
+
+    def _prefixed_terms(self, prefix: str) -> Iterator[str]:
+        """Yield up to `MAX_PREFIX_TERMS` terms starting with, but not equal to, `prefix`."""
+        start = bisect.bisect_right(self._sorted_terms, prefix)
+        for i in range(start, min(start + MAX_PREFIX_TERMS, len(self._sorted_terms))):
+            term = self._sorted_terms[i]
+            if not term.startswith(prefix):
+                return
+            yield term
+
+    def _fuzzy_candidates(self, query: str) -> list[str]:
+        """Return up to `MAX_FUZZY_CANDIDATES` terms that may be close to `query`.
+
+        Typos rarely hit the first letter, so only terms starting like `query` are considered, nearest
+        in sort order (longest common prefix) first, and only if their length allows a similarity ratio of
+        at least `FUZZY_CUTOFF`.
+        """
+        terms = self._sorted_terms
+        first = bisect.bisect_left(terms, query[0])
+        end = bisect.bisect_left(terms, chr(ord(query[0]) + 1))
+        position = bisect.bisect_left(terms, query, first, end)
+        min_length = len(query) * FUZZY_CUTOFF / (2 - FUZZY_CUTOFF)
+        max_length = len(query) * (2 - FUZZY_CUTOFF) / FUZZY_CUTOFF
+
+        candidates: list[str] = []
+        below, above = position - 1, position
+        for _ in range(MAX_FUZZY_SCAN):
+            if below < first and above >= end:
+                break
+            # Alternate between the neighbours before and after the query
+            if above >= end or (below >= first and position - below <= above - position):
+                term, below = terms[below], below - 1
+            else:
+                term, above = terms[above], above + 1
+            if min_length <= len(term) <= max_length:
+                candidates.append(term)
+                if len(candidates) == MAX_FUZZY_CANDIDATES:
+                    break
+        return candidates
+
+    def _remove_terms(self, asset: AssetData) -> None:
+        for term, field in self._asset_terms(asset):
+            ids = self._terms.get(term)
+            if ids is None:
+                continue
+            ids.discard((field, asset.id))
+            if not ids:
+                del self._terms[term]
+                del self._sorted_terms[bisect.bisect_left(self._sorted_terms, term)]
+
+    @staticmethod
+    def _asset_terms(asset: AssetData) -> set[tuple[str, int]]:
+        terms = {(asset.symbol.lower(), SYMBOL), (asset.name.lower(), NAME)}
+        words = asset.name.lower().split()
+        if len(words) > 1:
+            terms.update((word, NAME_WORD) for word in words)
+        return terms
+
+
+ASSET_INDEX = AssetIndex()
+
+_ASSET_LIST = TypeAdapter(list[AssetData])
+
+
+def read_asset_seed_file(path: Path) -> list[AssetData]:
+    """Read assets from a JSON file with a list of assets, or an object with the list under `data`."""
+    try:
+        content = json.loads(path.read_bytes())
+        if isinstance(content, dict):
+            content = content.get("data", [])
+        return _ASSET_LIST.validate_python(content)
+    except (OSError, ValueError, ValidationError):
+        LOGGER.warning("Ignoring unreadable asset seed file %s", path, exc_info=True)
+        return []
+
+
+def get_asset_cache(settings: Settings) -> TTLCache[Any]:
+    """Return the cache of seen assets, used to persist the index across restarts."""
+    return get_cache("assets", settings.asset_cache_max_entries, settings.asset_cache_ttl_s)
+
+
+def remember_asset(settings: Settings, asset: AssetData) -> None:
+    ASSET_INDEX.add(asset)
+    get_asset_cache(settings).set(asset.id, asset.model_dump())
+
+
+async def build_asset_index(settings: Settings) -> None:
+    """Fill the index from the seed file, then from the (restored) cache of seen assets."""
+    if settings.asset_index_seed_path is not None:
+        ASSET_INDEX.add_many(await asyncio.to_thread(read_asset_seed_file, settings.asset_index_seed_path))
+    ASSET_INDEX.add_many(AssetData(**value) for _, _, value in get_asset_cache(settings).dump())
+    LOGGER.info("Asset index contains %d assets", len(ASSET_INDEX))
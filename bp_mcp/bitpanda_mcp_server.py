@@ -11,19 +11,53 @@ Auth:
 Run:
 python -m bp_mcp.bitpanda_mcp_server
 MCP endpoint will be available at http://localhost:8000/mcp
+SERVER_WORKERS=0 runs one worker process per CPU, see README for production settings.
+
+python -m bp_mcp.bitpanda_mcp_server --transport stdio
+serves MCP over stdin/stdout for local clients.
 """
 
-from typing import Annotated
+import argparse
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, get_args
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, Query
 from fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 
+from bp_mcp.admission import AdmissionMiddleware, build_admission_controller
+from bp_mcp.asset_index import ASSET_INDEX, build_asset_index, get_asset_cache, remember_asset
 from bp_mcp.auth import APIKey, get_api_key
-from bp_mcp.exception_handlers import register_exception_handlers
-from bp_mcp.schemas import Asset, Settings, TransactionFlow, TransactionResponse, WalletResponse
-from bp_mcp.utils import bp_get
+from bp_mcp.circuit_breaker import BREAKERS
+from bp_mcp.compression import CompressionMiddleware
+from bp_mcp.exception_handlers import error_response, register_exception_handlers
+from bp_mcp.multi_wallet import MAX_MERGED_WALLETS, merge_wallet_transactions
+from bp_mcp.profiling import (
+    PROFILE_HEADER,
+    PROFILE_REPORTS,
+    ProfilingMiddleware,
+    is_profiling_token,
+    profile_phase,
+)
+from bp_mcp.schemas import (
+    Asset,
+    AssetSearchResponse,
+    HealthResponse,
+    McpTransport,
+    Settings,
+    TransactionFlow,
+    TransactionResponse,
+    WalletResponse,
+)
+from bp_mcp.snapshot import cache_snapshots
+from bp_mcp.utils import bp_get, close_http_client, get_asset_response_cache, get_stale_cache
 
 # ---------------------------
 # Configuration & Lifespan
@@ -42,15 +76,50 @@ app = FastAPI(
 )
 register_exception_handlers(app)
 
+# Admission control and profiling wrap the MCP HTTP app, see create_http_app. Profiling of the FastAPI app
+# records the phases of the requests forwarded by profiled tool calls.
+admission = build_admission_controller(settings)
+app.add_middleware(ProfilingMiddleware, settings=settings)
+
 
 # ---------------------------
 # Health Check
 # ---------------------------
 
 
-@app.get("/healthz", response_model=dict[str, str])
-async def health_check() -> dict[str, str]:
-    return {"status": "OK"}
+def health_report() -> HealthResponse:
+    upstream = {family: breaker.snapshot() for family, breaker in BREAKERS.items()}
+    degraded = any(state.state != "closed" for state in upstream.values())
+    return HealthResponse(
+        status="DEGRADED" if degraded else "OK", upstream=upstream, admission=admission.stats()
+    )
+
+
+@app.get("/healthz", response_model=HealthResponse)
+async def health_check() -> HealthResponse:
+    return health_report()
+
+
+async def http_health_check(_: Request) -> Response:
+    """`/healthz` of the MCP HTTP app, for load balancer probes."""
+    return JSONResponse(health_report().model_dump(mode="json"))
+
+
+# ---------------------------
+# Profiling
+# ---------------------------
+
+
+async def http_profile_report(request: Request) -> Response:
+    """`/debug/profiles/{profile_id}` of the MCP HTTP app: the report of a profiled request."""
+    report = PROFILE_REPORTS.get(request.path_params["profile_id"])
+    token = request.headers.get(PROFILE_HEADER)
+    if report is None or not is_profiling_token(token, settings.profiling_token):
+        # With several workers, the report may be kept by another one; it is also in the logs
+        return error_response(
+            status_code=404, error="Not Found", message="Profile report not found in this worker"
+        )
+    return JSONResponse(report.model_dump(mode="json"))
 
 
 # ---------------------------
@@ -70,8 +139,33 @@ async def get_asset(
     api_key: APIKey = Depends(get_api_key),
 ) -> Asset:
     """Return asset information by asset id (tokenscope transaction)."""
-    data = await bp_get(settings, f"/v1/assets/{asset_id}", api_key)
-    return Asset(**data)
+    data = await bp_get(settings, f"/v1/assets/{asset_id}", api_key, cache=get_asset_response_cache(settings))
+    with profile_phase("parse_validate"):
+        asset = Asset(**data)
+    remember_asset(settings, asset.data)
+    return asset
+
+
+@app.get(
+    "/v1/assets",
+    summary="Find asset IDs by symbol or name",
+    tags=["v1"],
+    operation_id="find_assets",
+    response_model=AssetSearchResponse,
+)
+async def find_assets(
+    query: Annotated[
+        str,
+        Query(min_length=1, description="Asset symbol or name (or a prefix of it), e.g. 'BTC' or 'Ethereum'"),
+    ],
+    limit: Annotated[int, Query(ge=1, le=50, description="Maximum number of assets to return")] = 10,
+    _: APIKey = Depends(get_api_key),
+) -> AssetSearchResponse:
+    """Look up asset IDs by symbol or name, best matches first, without calling Bitpanda.
+
+    Only assets known to this server (seen in responses or preloaded) can be found.
+    """
+    return AssetSearchResponse(data=ASSET_INDEX.search(query, limit))
 
 
 @app.get(
@@ -116,7 +210,70 @@ async def get_transactions(  # noqa: PLR0913
         if v is not None
     }
     data = await bp_get(settings, "/v1/transactions", api_key, params)
-    return TransactionResponse(**data)
+    with profile_phase("parse_validate"):
+        return TransactionResponse(**data)
+
+
+@app.get(
+    "/v1/transactions/merged",
+    summary="Get paginated transactions of several wallets merged by date",
+    tags=["v1"],
+    operation_id="get_wallets_transactions",
+    response_model=TransactionResponse,
+)
+async def get_wallets_transactions(  # noqa: PLR0913
+    wallet_id: Annotated[
+        list[str],
+        Query(min_length=1, max_length=MAX_MERGED_WALLETS, description="Wallet IDs to merge transactions of"),
+    ],
+    api_key: APIKey = Depends(get_api_key),
+    flow: Annotated[
+        TransactionFlow | None, Query(description="Filter transactions by flow direction")
+    ] = None,
+    asset_id: Annotated[
+        list[str] | None, Query(description="Filter transactions by asset identifier(s)")
+    ] = None,
+    from_including: Annotated[
+        str | None, Query(description="Filter transactions where credited_at >= given date-time")
+    ] = None,
+    to_excluding: Annotated[
+        str | None, Query(description="Filter transactions where credited_at < given date-time")
+    ] = None,
+    after: Annotated[
+        str | None, Query(description="Return values in page after cursor (end_cursor of the previous page)")
+    ] = None,
+    page_size: Annotated[int, Query(ge=1, le=100, description="Set pagination size")] = 25,
+) -> TransactionResponse:
+    """Return transactions of several wallets in one stream, newest first by credited_at.
+
+    Wallets are fetched concurrently and further upstream pages only as the merged page needs them.
+    """
+    filters = {
+        k: v
+        for k, v in {
+            "flow": flow or None,
+            "asset_id": asset_id,
+            "from_including": from_including,
+            "to_excluding": to_excluding,
+        }.items()
+        if v is not None
+    }
+
+    async def fetch_page(wallet: str, cursor: str | None, size: int) -> TransactionResponse:
+        params = {**filters, "wallet_id": wallet, "page_size": size}
+        if cursor is not None:
+            params["after"] = cursor
+        data = await bp_get(settings, "/v1/transactions", api_key, params)
+        with profile_phase("parse_validate"):
+            return TransactionResponse(**data)
+
+    return await merge_wallet_transactions(
+        list(dict.fromkeys(wallet_id)),
+        fetch_page,
+        page_size=page_size,
+        after=after,
+        concurrency=settings.multi_wallet_concurrency,
+    )
 
 
 @app.get(
@@ -157,10 +314,105 @@ async def get_wallets(  # noqa: PLR0913
         if v is not None
     }
     data = await bp_get(settings, "/v1/wallets/", api_key, params)
-    return WalletResponse(**data)
+    with profile_phase("parse_validate"):
+        return WalletResponse(**data)
+
+
+# ---------------------------
+# MCP
+# ---------------------------
+
+
+@asynccontextmanager
+async def lifespan(_: FastMCP) -> AsyncIterator[None]:
+    # Register caches up front so that they are restored from the snapshot
+    get_stale_cache(settings)
+    get_asset_response_cache(settings)
+    get_asset_cache(settings)
+    async with cache_snapshots(
+        settings.cache_snapshot_path, settings.cache_snapshot_interval_s, settings.cache_snapshot_caches
+    ):
+        await build_asset_index(settings)
+        try:
+            yield
+        finally:
+            await close_http_client()
+
+
+def create_mcp() -> FastMCP:
+    """Build the MCP server exposing the FastAPI endpoints as MCP tools."""
+    mcp = FastMCP.from_fastapi(app=app, lifespan=lifespan)
+    mcp.custom_route("/healthz", methods=["GET"])(http_health_check)
+    mcp.custom_route("/debug/profiles/{profile_id}", methods=["GET"])(http_profile_report)
+    return mcp
+
+
+def create_http_app() -> Starlette:
+    """Build the MCP streamable HTTP app."""
+    return create_mcp().http_app(
+        json_response=settings.mcp_json_response,
+        # MCP sessions live in the memory of one worker, the next request may hit another one
+        stateless_http=settings.server_workers != 1,
+        middleware=[
+            # Outermost, so that shed requests cost as little as possible
+            Middleware(
+                AdmissionMiddleware, controller=admission, retry_after_s=settings.overload_retry_after_s
+            ),
+            # Response headers of tool calls are only seen here, the MCP result drops those of the FastAPI app
+            Middleware(ProfilingMiddleware, settings=settings),
+            Middleware(
+                CompressionMiddleware,
+                minimum_size=settings.compression_min_size,
+                level=settings.compression_level,
+            ),
+        ],
+    )
+
+
+HTTP_APP_FACTORY = "bp_mcp.bitpanda_mcp_server:create_http_app"
+
+
+def uvicorn_options(settings: Settings) -> dict[str, Any]:
+    """Return the `uvicorn.run` arguments serving the MCP HTTP app as configured in `settings`."""
+    workers = settings.server_workers or os.cpu_count() or 1
+    options: dict[str, Any] = {
+        "host": settings.server_host,
+        "port": settings.server_port,
+        "loop": settings.server_loop,
+        "http": settings.server_http,
+        "backlog": settings.server_backlog,
+        "timeout_keep_alive": settings.server_keep_alive_s,
+        "timeout_graceful_shutdown": settings.server_graceful_shutdown_s,
+    }
+    if workers == 1 and not settings.server_reload:
+        return {"app": create_http_app(), **options}
+    # Worker processes and the reloader import the app themselves
+    return {
+        "app": HTTP_APP_FACTORY,
+        "factory": True,
+        "workers": workers,
+        "reload": settings.server_reload,
+        **options,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bitpanda Developer API MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=get_args(McpTransport),
+        default=settings.mcp_transport,
+        help="'http' serves MCP on http://<SERVER_HOST>:<SERVER_PORT>/mcp, 'stdio' talks MCP over "
+        "stdin/stdout for local clients (auth falls back to BITPANDA_API_KEY)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.transport == "stdio":
+        # Tool calls go straight to the FastAPI app in-process, without the HTTP server
+        create_mcp().run(transport="stdio", show_banner=False)
+    else:
+        uvicorn.run(**uvicorn_options(settings))
 
 
 if __name__ == "__main__":  # pragma: no cover
-    mcp = FastMCP.from_fastapi(app=app)
-    http_app = mcp.http_app()
-    uvicorn.run(http_app, host=settings.server_host, port=settings.server_port)
+    main()
@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any, Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU mapping whose entries expire `ttl_s` seconds after they were stored.
+
+    Expiry uses wall-clock time so entries keep their meaning outside of the current process.
+    """
+
+    def __init__(self, max_entries: int, ttl_s: float, clock: Callable[[], float] = time.time) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_s > 0
+
+    def get(self, key: str) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (self._clock() + self.ttl_s, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def dump(self) -> list[tuple[str, float, V]]:
+        """Return all entries as `(key, expires_at, value)`, oldest first."""
+        return [(key, expires_at, value) for key, (expires_at, value) in self._entries.items()]
+
+    def load(self, entries: Iterable[tuple[str, float, V]]) -> int:
+        """Restore entries from `dump`, keeping their original expiry. Return the number restored."""
+        if not self.enabled:
+            return 0
+        now = self._clock()
+        restored = 0
+        for key, expires_at, value in entries:
+            if expires_at > now and key not in self._entries:
+                # Never extend the expiry of a restored entry beyond the current TTL
+                self._entries[key] = (min(expires_at, now + self.ttl_s), value)
+                restored += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return restored
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Named caches shared across requests
+CACHES: dict[str, TTLCache[Any]] = {}
+
+
+def get_cache(name: str, max_entries: int, ttl_s: float) -> TTLCache[Any]:
+    cache = CACHES.get(name)
+    if cache is None:
+        cache = CACHES[name] = TTLCache(max_entries, ttl_s)
+    return cache
@@ -0,0 +1,135 @@
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Literal
+
+from bp_mcp.schemas import CircuitBreakerState, Settings
+
+LOGGER = logging.getLogger(__name__)
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker guarding one family of upstream endpoints.
+
+    - closed: calls go through; outcomes are kept in a rolling window of the last `window` calls.
+      Once at least `min_calls` were recorded and the failure rate reaches `failure_rate`, it opens.
+    - open: calls are rejected until `open_s` seconds have passed.
+    - half_open: up to `half_open_calls` trial calls go through. A success closes the breaker,
+      a failure opens it again. Trials ending without an outcome (e.g. cancelled) must be released.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        failure_rate: float,
+        window: int,
+        min_calls: int,
+        open_s: float,
+        half_open_calls: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_s = open_s
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state: BreakerState = "closed"
+        self._opened_at = 0.0
+        self._trials_in_flight = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == "open" and self._clock() - self._opened_at >= self.open_s:
+            self._state = "half_open"
+            self._trials_in_flight = 0
+        return self._state
+
+    @property
+    def current_failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a trial call through again."""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self.open_s - (self._clock() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and self._trials_in_flight < self.half_open_calls:
+            self._trials_in_flight += 1
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state == "half_open":
+            LOGGER.info("Circuit breaker '%s' closed", self.name)
+            self._state = "closed"
+            self._outcomes.clear()
+            self._trials_in_flight = 0
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        self._outcomes.append(False)
+        if self._state == "half_open" or (
+            self._state == "closed"
+            and len(self._outcomes) >= self.min_calls
+            and self.current_failure_rate >= self.failure_rate
+        ):
+            self._open()
+
+    def release_trial(self) -> None:
+        """Free the slot of a half-open trial call that ended without an outcome."""
+        if self._state == "half_open" and self._trials_in_flight > 0:
+            self._trials_in_flight -= 1
+
+    def snapshot(self) -> CircuitBreakerState:
+        return CircuitBreakerState(
+            state=self.state,
+            failure_rate=round(self.current_failure_rate, 3),
+            calls=len(self._outcomes),
+            retry_after_s=round(self.retry_after(), 3),
+        )
+
+    def _open(self) -> None:
+        LOGGER.warning(
+            "Circuit breaker '%s' opened (failure rate %.0f%%)", self.name, self.current_failure_rate * 100
+        )
+        self._state = "open"
+        self._opened_at = self._clock()
+        self._trials_in_flight = 0
+
+
+# One breaker per endpoint family (e.g. "assets", "transactions", "wallets")
+BREAKERS: dict[str, CircuitBreaker] = {}
+
+
+def endpoint_family(path: str) -> str:
+    """Return the endpoint family of an upstream path, e.g. `/v1/assets/<id>` -> `assets`."""
+    parts = [part for part in path.split("/") if part]
+    if len(parts) > 1 and parts[0].startswith("v"):
+        return parts[1]
+    return parts[0] if parts else ""
+
+
+def get_circuit_breaker(settings: Settings, family: str) -> CircuitBreaker:
+    breaker = BREAKERS.get(family)
+    if breaker is None:
+        breaker = BREAKERS[family] = CircuitBreaker(
+            name=family,
+            failure_rate=settings.circuit_breaker_failure_rate,
+            window=settings.circuit_breaker_window,
+            min_calls=settings.circuit_breaker_min_calls,
+            open_s=settings.circuit_breaker_open_s,
+            half_open_calls=settings.circuit_breaker_half_open_calls,
+        )
+    return breaker
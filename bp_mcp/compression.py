@@ -0,0 +1,132 @@
+import gzip
+import importlib
+from collections.abc import Callable
+from types import ModuleType
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _optional_module(name: str) -> ModuleType | None:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+brotli = _optional_module("brotli")
+zstandard = _optional_module("zstandard")
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    return gzip.compress(body, compresslevel=min(level, 9), mtime=0)
+
+
+def _brotli(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=min(level, 11))  # type: ignore[union-attr, no-any-return]
+
+
+def _zstd(body: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(body)  # type: ignore[union-attr, no-any-return]
+
+
+# Supported content codings, in order of server preference. zstd and br need optional packages,
+# the same ones httpx uses to decode them.
+ENCODERS: dict[str, Callable[[bytes, int], bytes]] = {
+    **({"zstd": _zstd} if zstandard else {}),
+    **({"br": _brotli} if brotli else {}),
+    "gzip": _gzip,
+}
+
+ACCEPT_ENCODING = ", ".join(ENCODERS)
+
+# Streaming responses can't be compressed as a whole
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick the content coding to use for an `Accept-Encoding` header, if any."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        key, _, value = params.strip().partition("=")
+        if key.strip() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best: str | None = None
+    best_q = 0.0
+    for encoding in ENCODERS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies of at least `minimum_size` bytes.
+
+    The encoding (zstd, br or gzip) is negotiated from the request `Accept-Encoding` header.
+    `level` is the gzip/zstd compression level and is capped at 11 for brotli.
+    Whether to compress is decided on the response start: only responses with a `Content-Length` of at
+    least `minimum_size` are held back to be compressed. Streamed responses are passed through unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 6) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = None
+        if scope["type"] == "http":
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                if self._compressible(Headers(raw=message["headers"])):
+                    # Hold back the headers until the body arrives
+                    start_message = message
+                else:
+                    await send(message)
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Chunked despite its Content-Length, leave it alone
+                await send(start)
+                await send(message)
+                return
+
+            compressed = ENCODERS[encoding](body, self.level)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, headers: Headers) -> bool:
+        content_length = headers.get("content-length", "")
+        return (
+            content_length.isdigit()
+            and int(content_length) >= self.minimum_size
+            and "content-encoding" not in headers
+            and not headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+        )
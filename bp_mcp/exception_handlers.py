@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Mapping
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse
@@ -6,6 +7,21 @@ from fastapi.responses import JSONResponse
 LOGGER = logging.getLogger(__name__)
 
 
+def error_response(
+    status_code: int, error: str, message: str | None, headers: Mapping[str, str] | None = None
+) -> JSONResponse:
+    """Build a response in Developer API ErrorObject format."""
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "status": status_code,
+            "error": error,
+            "message": message,
+        },
+        headers=headers,
+    )
+
+
 def register_exception_handlers(api: FastAPI) -> None:
     @api.exception_handler(HTTPException)
     async def http_exception_handler(_: Request, exc: HTTPException) -> JSONResponse:
@@ -23,27 +39,18 @@ def register_exception_handlers(api: FastAPI) -> None:
                         }
                     ]
                 },
+                headers=exc.headers,
             )
 
         # For other HTTP errors, use ErrorObject format
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "status": exc.status_code,
-                "error": exc.__class__.__name__,
-                "message": exc.detail,
-            },
-        )
+        return error_response(exc.status_code, exc.__class__.__name__, exc.detail, exc.headers)
 
     @api.exception_handler(Exception)
     async def unhandled_exception(_: Request, exc: Exception) -> JSONResponse:
         """Handle unhandled exceptions with Developer API error format."""
         LOGGER.exception("API unhandled exception")
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
-                "error": "Internal Server Error",
-                "message": f"API unhandled exception: {exc!s}",
-            },
+        return error_response(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "Internal Server Error",
+            f"API unhandled exception: {exc!s}",
         )
@@ -0,0 +1,166 @@
+"""Merged transaction stream over several wallets.
+
+Each wallet's transactions are paged from upstream lazily and k-way merged by `credited_at`, newest first
+like the upstream API. The merged cursor is stateless: for every wallet it holds the upstream cursor of
+the page being consumed and how many of its transactions were already returned.
+"""
+
+import asyncio
+import base64
+import binascii
+import heapq
+import json
+from collections.abc import Awaitable, Callable
+
+from fastapi import HTTPException
+
+from bp_mcp.schemas import Transaction, TransactionResponse
+
+MAX_MERGED_WALLETS = 50
+MAX_UPSTREAM_PAGE_SIZE = 100
+
+# (upstream cursor of the page being consumed, transactions already returned from it), None when exhausted
+WalletPosition = tuple[str | None, int] | None
+FetchPage = Callable[[str, str | None, int], Awaitable[TransactionResponse]]
+
+
+class WalletStream:
+    """Transactions of one wallet, fetched from upstream one page at a time when needed."""
+
+    def __init__(
+        self, wallet_id: str, position: WalletPosition, fetch_page: FetchPage, page_size: int
+    ) -> None:
+        self.wallet_id = wallet_id
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._exhausted = position is None
+        self._page_cursor, self._offset = position or (None, 0)
+        self._page: list[Transaction] | None = None
+        self._next_cursor: str | None = None
+        # Whether a page was served stale from the last known good responses (upstream failing)
+        self.stale = False
+
+    async def head(self) -> Transaction | None:
+        """Return the next transaction without consuming it, fetching pages as needed."""
+        while not self._exhausted:
+            if self._page is None:
+                response = await self._fetch_page(self.wallet_id, self._page_cursor, self._page_size)
+                self._page = response.data or []
+                self.stale = self.stale or bool(response.stale)
+                self._next_cursor = response.end_cursor if response.has_next_page else None
+            if self._offset < len(self._page):
+                return self._page[self._offset]
+            self._advance_page()
+        return None
+
+    def pop(self) -> Transaction:
+        if self._page is None:
+            raise RuntimeError("head() must be awaited before pop()")
+        transaction = self._page[self._offset]
+        self._offset += 1
+        return transaction
+
+    def position(self) -> WalletPosition:
+        if self._page is not None and self._offset >= len(self._page):
+            # Page fully returned, continue with the next one without refetching this one
+            self._advance_page()
+        if self._exhausted:
+            return None
+        return self._page_cursor, self._offset
+
+    def _advance_page(self) -> None:
+        if self._next_cursor is None:
+            self._exhausted = True
+        self._page_cursor, self._offset = self._next_cursor, 0
+        self._page, self._next_cursor = None, None
+
+
+def encode_cursor(page_size: int, positions: dict[str, WalletPosition]) -> str:
+    payload = json.dumps({"s": page_size, "p": positions}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_position(position: object) -> WalletPosition:
+    if position is None:
+        return None
+    if not isinstance(position, list) or len(position) != 2:  # noqa: PLR2004
+        raise ValueError(f"Invalid wallet position: {position!r}")
+    page_cursor, offset = position
+    # bool is an int, upstream cursors are opaque strings
+    if not isinstance(page_cursor, str | None) or type(offset) is not int or offset < 0:
+        raise ValueError(f"Invalid wallet position: {position!r}")
+    return page_cursor, offset
+
+
+def decode_cursor(cursor: str, wallet_ids: list[str]) -> tuple[int, dict[str, WalletPosition]]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        page_size = int(payload["s"])
+        positions = {wallet_id: _decode_position(position) for wallet_id, position in payload["p"].items()}
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError, AttributeError) as err:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from err
+    if not 1 <= page_size <= MAX_UPSTREAM_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if set(positions) != set(wallet_ids):
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested wallet_id list")
+    return page_size, positions
+
+
+async def merge_wallet_transactions(
+    wallet_ids: list[str],
+    fetch_page: FetchPage,
+    page_size: int,
+    after: str | None = None,
+    concurrency: int = 5,
+) -> TransactionResponse:
+    """Return the next `page_size` transactions of all wallets, newest first.
+
+    The first page of every wallet is fetched concurrently, with at most `concurrency` upstream requests
+    in flight. Further upstream pages are only fetched when the merge reaches the end of a page.
+    The result is `stale` if any upstream page fetched for it was.
+    """
+    upstream_page_size = page_size
+    positions: dict[str, WalletPosition] = dict.fromkeys(wallet_ids, (None, 0))
+    if after is not None:
+        upstream_page_size, positions = decode_cursor(after, wallet_ids)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded_fetch_page(wallet_id: str, cursor: str | None, size: int) -> TransactionResponse:
+        async with semaphore:
+            return await fetch_page(wallet_id, cursor, size)
+
+    streams = [
+        WalletStream(wallet_id, positions[wallet_id], bounded_fetch_page, upstream_page_size)
+        for wallet_id in wallet_ids
+    ]
+    try:
+        async with asyncio.TaskGroup() as group:
+            head_tasks = [group.create_task(stream.head()) for stream in streams]
+    except BaseExceptionGroup as errors:
+        # The other fetches are cancelled; raise the failure as is, e.g. the HTTPException of upstream
+        raise errors.exceptions[0] from None
+    heads = [task.result() for task in head_tasks]
+
+    # Newest first; ties keep the order of the requested wallets
+    heap = [(-head.credited_at.timestamp(), i) for i, head in enumerate(heads) if head is not None]
+    heapq.heapify(heap)
+    data: list[Transaction] = []
+    while heap and len(data) < page_size:
+        _, i = heapq.heappop(heap)
+        data.append(streams[i].pop())
+        if len(data) == page_size:
+            break
+        head = await streams[i].head()
+        if head is not None:
+            heapq.heappush(heap, (-head.credited_at.timestamp(), i))
+
+    next_positions = {stream.wallet_id: stream.position() for stream in streams}
+    has_next_page = any(position is not None for position in next_positions.values())
+    return TransactionResponse(
+        end_cursor=encode_cursor(upstream_page_size, next_positions) if has_next_page else None,
+        has_next_page=has_next_page,
+        page_size=page_size,
+        data=data,
+        stale=True if any(stream.stale for stream in streams) else None,
+    )
@@ -0,0 +1,189 @@
+"""Opt-in profiling of single requests.
+
+Requests carrying the configured token in `PROFILE_HEADER` are profiled: time is split into phases
+(upstream I/O, parse/validate, encode) and a CPU profile of the event loop thread is captured while
+the request runs. Phase timings are returned in a `Server-Timing` header, the full report is kept for
+a while and can be fetched with the id from the `X-Profile-Id` header. Reports are kept by the worker
+process that profiled the request, so they are also logged in full for multi-worker deployments.
+
+MCP tool calls are forwarded to the FastAPI app as separate requests, which don't share the context
+of the MCP request. The profiled MCP request passes its id in `PROFILE_ID_HEADER` and the forwarded
+request records its phases into the same profile.
+"""
+
+import cProfile
+import hmac
+import io
+import logging
+import pstats
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from bp_mcp.cache import TTLCache
+from bp_mcp.schemas import ProfileReport, Settings
+
+LOGGER = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+CPU_PROFILE_LINES = 30
+
+# Reports are for debugging only, so they are not part of the persisted caches
+PROFILE_REPORTS: TTLCache[ProfileReport] = TTLCache(max_entries=100, ttl_s=3600)
+
+
+class RequestProfile:
+    """Phase timings of one request."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.last_phase_end = self.started
+
+    def add(self, phase: str, started: float) -> None:
+        self.last_phase_end = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + self.last_phase_end - started
+
+
+PROFILE: ContextVar[RequestProfile | None] = ContextVar("profile", default=None)
+# Profiles of requests being handled, by report id, for the requests they forward
+ACTIVE_PROFILES: dict[str, RequestProfile] = {}
+
+
+@contextmanager
+def profile_phase(phase: str) -> Iterator[None]:
+    """Account the time spent in the block to `phase` if the current request is profiled."""
+    profile = PROFILE.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(phase, started)
+
+
+def is_profiling_token(token: str | None, expected: str | None) -> bool:
+    return token is not None and expected is not None and hmac.compare_digest(token, expected)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that carry the profiling token.
+
+    The encode phase is the time between the end of the last recorded phase and the response start,
+    i.e. response serialization. Time not covered by any phase (auth, routing, queueing) is `other`.
+    A request forwarded by a profiled request (see the module docstring) adds to its phases instead.
+
+    The CPU profiler is deterministic and sees everything running on the event loop thread, so it is
+    only started when no other request is in flight. Requests starting while it runs are counted in
+    the report, their frames are part of the CPU profile.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings) -> None:
+        self.app = app
+        self.settings = settings
+        self._in_flight = 0
+        self._cpu_report: ProfileReport | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        token = self.settings.profiling_token
+        if token is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._in_flight += 1
+        if self._cpu_report is not None:
+            self._cpu_report.concurrent_requests += 1
+        try:
+            headers = Headers(scope=scope)
+            if not is_profiling_token(headers.get(PROFILE_HEADER), token):
+                await self.app(scope, receive, send)
+            elif (forwarding := ACTIVE_PROFILES.get(headers.get(PROFILE_ID_HEADER, ""))) is not None:
+                context_token = PROFILE.set(forwarding)
+                try:
+                    await self.app(scope, receive, send)
+                finally:
+                    PROFILE.reset(context_token)
+            else:
+                await self._profile(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profile = RequestProfile()
+        report = ProfileReport(id=uuid.uuid4().hex, method=scope["method"], path=scope["path"])
+        # Pass the id on to the requests forwarded while handling this one
+        scope = {**scope, "headers": list(scope["headers"])}
+        MutableHeaders(scope=scope)[PROFILE_ID_HEADER] = report.id
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                report.status_code = message["status"]
+                headers = MutableHeaders(raw=message["headers"])
+                headers[PROFILE_ID_HEADER] = report.id
+                # Event streams start before the work is done, their phases are only in the report
+                if not headers.get("content-type", "").startswith("text/event-stream"):
+                    self._finish_phases(profile, report)
+                    headers.append(
+                        "Server-Timing",
+                        ", ".join(f"{phase};dur={duration}" for phase, duration in report.phases_ms.items()),
+                    )
+            await send(message)
+
+        cpu_profiler = self._start_cpu_profiler(report)
+        context_token = PROFILE.set(profile)
+        ACTIVE_PROFILES[report.id] = profile
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            del ACTIVE_PROFILES[report.id]
+            PROFILE.reset(context_token)
+            if not report.phases_ms:
+                self._finish_phases(profile, report)
+            if cpu_profiler is not None:
+                cpu_profiler.disable()
+                self._cpu_report = None
+                report.cpu_profile = self._format_cpu_profile(cpu_profiler)
+                if report.concurrent_requests:
+                    report.cpu_profile_note = (
+                        f"Includes the frames of {report.concurrent_requests} other requests"
+                    )
+            PROFILE_REPORTS.set(report.id, report)
+            LOGGER.info("Profiled %s %s: %s", report.method, report.path, report.model_dump_json())
+
+    def _start_cpu_profiler(self, report: ProfileReport) -> cProfile.Profile | None:
+        if self._in_flight > 1:
+            report.cpu_profile_note = f"Not captured, {self._in_flight - 1} other requests were in flight"
+            return None
+        cpu_profiler = cProfile.Profile()
+        try:
+            cpu_profiler.enable()
+        except ValueError:
+            report.cpu_profile_note = "Not captured, another profiler is active"
+            return None
+        self._cpu_report = report
+        return cpu_profiler
+
+    @staticmethod
+    def _finish_phases(profile: RequestProfile, report: ProfileReport) -> None:
+        now = time.perf_counter()
+        phases = dict(profile.phases)
+        if phases:
+            phases["encode"] = now - profile.last_phase_end
+        total = now - profile.started
+        phases["other"] = max(0.0, total - sum(phases.values()))
+        phases["total"] = total
+        report.phases_ms = {phase: round(duration * 1000, 3) for phase, duration in phases.items()}
+
+    @staticmethod
+    def _format_cpu_profile(cpu_profiler: cProfile.Profile) -> str:
+        stream = io.StringIO()
+        pstats.Stats(cpu_profiler, stream=stream).sort_stats("cumulative").print_stats(CPU_PROFILE_LINES)
+        return stream.getvalue()
@@ -1,10 +1,16 @@
 # Settings
 # Assets
-from .assets import Asset, AssetData
+from .assets import Asset, AssetData, AssetSearchResponse
 
 # Errors
 from .errors import AuthorizationError, ErrorObject, SingleAuthorizationError
-from .settings import Settings
+
+# Health
+from .health import AdmissionStats, CircuitBreakerState, HealthResponse
+
+# Profiling
+from .profiling import ProfileReport
+from .settings import McpTransport, Settings
 
 # Transactions
 from .transactions import Transaction, TransactionFlow, TransactionResponse
@@ -13,10 +19,16 @@ from .transactions import Transaction, TransactionFlow, TransactionResponse
 from .wallets import Wallet, WalletResponse, WalletType
 
 __all__ = [
+    "AdmissionStats",
     "Asset",
     "AssetData",
+    "AssetSearchResponse",
     "AuthorizationError",
+    "CircuitBreakerState",
     "ErrorObject",
+    "HealthResponse",
+    "McpTransport",
+    "ProfileReport",
     "Settings",
     "SingleAuthorizationError",
     "Transaction",
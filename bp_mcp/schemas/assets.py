@@ -15,3 +15,13 @@ class Asset(BaseModel):
     """Asset response."""
 
     data: AssetData
+    stale: bool | None = Field(
+        default=None,
+        description="True when served from the last known good response during an upstream outage",
+    )
+
+
+class AssetSearchResponse(BaseModel):
+    """Assets matching a symbol or name lookup."""
+
+    data: list[AssetData]
@@ -0,0 +1,37 @@
+"""Health check schemas."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class CircuitBreakerState(BaseModel):
+    """State of the circuit breaker guarding one upstream endpoint family."""
+
+    state: Literal["closed", "open", "half_open"]
+    failure_rate: float = Field(description="Failure rate over the rolling window of recent calls")
+    calls: int = Field(description="Number of calls in the rolling window")
+    retry_after_s: float = Field(description="Seconds until a trial call is allowed while open")
+
+
+class AdmissionStats(BaseModel):
+    """Admission control and request queue metrics."""
+
+    in_flight: int = Field(description="Requests currently being processed")
+    queued: int = Field(description="Requests currently waiting for a free slot")
+    max_in_flight: int
+    max_queued: int
+    admitted_total: int = Field(description="Requests admitted since startup")
+    rejected_total: int = Field(description="Requests shed with 503 since startup")
+    queue_wait_avg_ms: float = Field(description="Average wait of queued requests")
+    queue_wait_max_ms: float = Field(description="Longest wait of a queued request")
+
+
+class HealthResponse(BaseModel):
+    """Health check response."""
+
+    status: Literal["OK", "DEGRADED"]
+    upstream: dict[str, CircuitBreakerState] = Field(
+        default_factory=dict, description="Circuit breaker state per upstream endpoint family"
+    )
+    admission: AdmissionStats | None = None
@@ -0,0 +1,28 @@
+"""Request profiling schemas."""
+
+import os
+
+from pydantic import BaseModel, Field
+
+
+class ProfileReport(BaseModel):
+    """Profile of a single request."""
+
+    id: str
+    method: str
+    path: str
+    status_code: int | None = None
+    pid: int = Field(default_factory=os.getpid, description="Worker process that profiled the request")
+    phases_ms: dict[str, float] = Field(
+        default_factory=dict,
+        description="Milliseconds spent per phase (upstream, parse_validate, encode, other) and in total",
+    )
+    cpu_profile: str | None = Field(default=None, description="Top functions by cumulative CPU time")
+    concurrent_requests: int = Field(
+        default=0,
+        description="Other requests that ran on the event loop while the CPU profile was captured; "
+        "their frames are included in it",
+    )
+    cpu_profile_note: str | None = Field(
+        default=None, description="Why the CPU profile is missing, or that it includes other requests"
+    )
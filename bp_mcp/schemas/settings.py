@@ -1,7 +1,13 @@
 import os
+from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
+McpTransport = Literal["http", "stdio"]
+ServerLoop = Literal["auto", "asyncio", "uvloop"]
+ServerHttp = Literal["auto", "h11", "httptools"]
+
 
 class Settings(BaseModel):
     bitpanda_base_url: str = Field(
@@ -10,10 +16,196 @@ class Settings(BaseModel):
     )
     request_timeout_s: float = Field(default=30.0, ge=1, le=120)
     server_host: str = Field(
-        default_factory=lambda: os.environ["SERVER_HOST"],
+        default_factory=lambda: os.getenv("SERVER_HOST", "0.0.0.0"),  # noqa: S104
         description="Host address to bind the server (override with SERVER_HOST).",
     )
     server_port: int = Field(
-        default_factory=lambda: int(os.environ["SERVER_PORT"]),
+        default_factory=lambda: int(os.getenv("SERVER_PORT", "8000")),
         description="Port to bind the server (override with SERVER_PORT).",
     )
+    server_workers: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_WORKERS", "1")),
+        ge=0,
+        description="Number of server worker processes, 0 for one per CPU (override with SERVER_WORKERS).",
+    )
+    server_loop: ServerLoop = Field(
+        default_factory=lambda: os.getenv("SERVER_LOOP", "auto"),
+        validate_default=True,
+        description="Event loop of the HTTP server, 'auto' uses uvloop when installed (override with "
+        "SERVER_LOOP).",
+    )
+    server_http: ServerHttp = Field(
+        default_factory=lambda: os.getenv("SERVER_HTTP", "auto"),
+        validate_default=True,
+        description="HTTP/1.1 parser of the HTTP server, 'auto' uses httptools when installed (override with "
+        "SERVER_HTTP).",
+    )
+    server_backlog: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_BACKLOG", "2048")),
+        ge=1,
+        description="Maximum pending connections of the listening socket (override with SERVER_BACKLOG).",
+    )
+    server_keep_alive_s: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_KEEP_ALIVE_S", "75")),
+        ge=1,
+        description="Seconds idle client connections are kept open, longer than the idle timeout of the load "
+        "balancer in front (override with SERVER_KEEP_ALIVE_S).",
+    )
+    server_graceful_shutdown_s: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_S", "25")),
+        ge=0,
+        description="Seconds in-flight requests may take to finish on shutdown, less than the kill timeout "
+        "of the orchestrator (override with SERVER_GRACEFUL_SHUTDOWN_S).",
+    )
+    server_reload: bool = Field(
+        default_factory=lambda: os.getenv("SERVER_RELOAD", "false").lower() == "true",
+        description="Restart the server on code changes, for development only (override with SERVER_RELOAD).",
+    )
+    circuit_breaker_failure_rate: float = Field(
+        default_factory=lambda: float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5")),
+        gt=0,
+        le=1,
+        description="Upstream failure rate that opens a circuit breaker (override with "
+        "CIRCUIT_BREAKER_FAILURE_RATE).",
+    )
+    circuit_breaker_window: int = Field(
+        default_factory=lambda: int(os.getenv("CIRCUIT_BREAKER_WINDOW", "20")),
+        ge=1,
+        description="Number of recent upstream calls used to compute the failure rate (override with "
+        "CIRCUIT_BREAKER_WINDOW).",
+    )
+    circuit_breaker_min_calls: int = Field(
+        default_factory=lambda: int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "5")),
+        ge=1,
+        description="Minimum calls in the window before a circuit breaker may open (override with "
+        "CIRCUIT_BREAKER_MIN_CALLS).",
+    )
+    circuit_breaker_open_s: float = Field(
+        default_factory=lambda: float(os.getenv("CIRCUIT_BREAKER_OPEN_S", "30")),
+        gt=0,
+        description="Seconds an open circuit breaker fails fast before allowing trial calls (override with "
+        "CIRCUIT_BREAKER_OPEN_S).",
+    )
+    circuit_breaker_half_open_calls: int = Field(
+        default_factory=lambda: int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_CALLS", "1")),
+        ge=1,
+        description="Concurrent trial calls allowed while half-open (override with "
+        "CIRCUIT_BREAKER_HALF_OPEN_CALLS).",
+    )
+    stale_cache_ttl_s: float = Field(
+        default_factory=lambda: float(os.getenv("STALE_CACHE_TTL_S", "600")),
+        ge=0,
+        description="How long the last good upstream response may be served as stale while upstream is "
+        "failing, 0 disables serving stale responses (override with STALE_CACHE_TTL_S).",
+    )
+    stale_cache_max_entries: int = Field(
+        default_factory=lambda: int(os.getenv("STALE_CACHE_MAX_ENTRIES", "1024")),
+        ge=0,
+        description="Maximum number of upstream responses kept for serving stale (override with "
+        "STALE_CACHE_MAX_ENTRIES).",
+    )
+    asset_response_cache_ttl_s: float = Field(
+        default_factory=lambda: float(os.getenv("ASSET_RESPONSE_CACHE_TTL_S", "3600")),
+        ge=0,
+        description="How long asset responses are served from cache without calling upstream, 0 disables "
+        "the cache (override with ASSET_RESPONSE_CACHE_TTL_S).",
+    )
+    asset_response_cache_max_entries: int = Field(
+        default_factory=lambda: int(os.getenv("ASSET_RESPONSE_CACHE_MAX_ENTRIES", "4096")),
+        ge=0,
+        description="Maximum number of cached asset responses (override with "
+        "ASSET_RESPONSE_CACHE_MAX_ENTRIES).",
+    )
+    max_in_flight_requests: int = Field(
+        default_factory=lambda: int(os.getenv("MAX_IN_FLIGHT_REQUESTS", "64")),
+        ge=1,
+        description="Maximum number of requests processed concurrently (override with "
+        "MAX_IN_FLIGHT_REQUESTS).",
+    )
+    max_queued_requests: int = Field(
+        default_factory=lambda: int(os.getenv("MAX_QUEUED_REQUESTS", "128")),
+        ge=0,
+        description="Maximum number of requests waiting for a free slot before new ones are rejected "
+        "(override with MAX_QUEUED_REQUESTS).",
+    )
+    admission_queue_timeout_s: float = Field(
+        default_factory=lambda: float(os.getenv("ADMISSION_QUEUE_TIMEOUT_S", "5")),
+        gt=0,
+        description="Maximum time a request waits for a free slot (override with ADMISSION_QUEUE_TIMEOUT_S).",
+    )
+    overload_retry_after_s: int = Field(
+        default_factory=lambda: int(os.getenv("OVERLOAD_RETRY_AFTER_S", "1")),
+        ge=0,
+        description="Retry-After sent with 503 responses when overloaded (override with "
+        "OVERLOAD_RETRY_AFTER_S).",
+    )
+    compression_min_size: int = Field(
+        default_factory=lambda: int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+        ge=0,
+        description="Minimum response size in bytes to compress (override with COMPRESSION_MIN_SIZE).",
+    )
+    compression_level: int = Field(
+        default_factory=lambda: int(os.getenv("COMPRESSION_LEVEL", "6")),
+        ge=1,
+        le=22,
+        description="Compression level, capped at 9 for gzip and 11 for brotli (override with "
+        "COMPRESSION_LEVEL).",
+    )
+    mcp_json_response: bool = Field(
+        default_factory=lambda: os.getenv("MCP_JSON_RESPONSE", "true").lower() == "true",
+        description="Answer MCP requests with plain JSON instead of SSE streams so that responses can be "
+        "compressed (override with MCP_JSON_RESPONSE).",
+    )
+    cache_snapshot_path: Path | None = Field(
+        default_factory=lambda: Path(path) if (path := os.getenv("CACHE_SNAPSHOT_PATH")) else None,
+        description="File caches are persisted to and restored from across restarts, disabled when unset "
+        "(override with CACHE_SNAPSHOT_PATH).",
+    )
+    cache_snapshot_interval_s: float = Field(
+        default_factory=lambda: float(os.getenv("CACHE_SNAPSHOT_INTERVAL_S", "60")),
+        gt=0,
+        description="Seconds between cache snapshots (override with CACHE_SNAPSHOT_INTERVAL_S).",
+    )
+    cache_snapshot_caches: list[str] = Field(
+        default_factory=lambda: [
+            name.strip()
+            for name in os.getenv("CACHE_SNAPSHOT_CACHES", "asset_responses,assets").split(",")
+            if name.strip()
+        ],
+        description="Comma-separated names of the caches to snapshot. 'stale_responses' holds every user's "
+        "wallet and transaction data and is left out by default (override with CACHE_SNAPSHOT_CACHES).",
+    )
+    asset_index_seed_path: Path | None = Field(
+        default_factory=lambda: Path(path) if (path := os.getenv("ASSET_INDEX_SEED_PATH")) else None,
+        description="JSON file with assets (id, name, symbol) preloaded into the asset lookup index "
+        "(override with ASSET_INDEX_SEED_PATH).",
+    )
+    asset_cache_ttl_s: float = Field(
+        default_factory=lambda: float(os.getenv("ASSET_CACHE_TTL_S", "604800")),
+        ge=0,
+        description="How long assets seen in responses are kept for the lookup index across restarts "
+        "(override with ASSET_CACHE_TTL_S).",
+    )
+    asset_cache_max_entries: int = Field(
+        default_factory=lambda: int(os.getenv("ASSET_CACHE_MAX_ENTRIES", "20000")),
+        ge=0,
+        description="Maximum number of assets kept for the lookup index across restarts (override with "
+        "ASSET_CACHE_MAX_ENTRIES).",
+    )
+    profiling_token: str | None = Field(
+        default_factory=lambda: os.getenv("PROFILING_TOKEN") or None,
+        description="Enables profiling of requests sending this value in the X-Profile-Token header "
+        "(override with PROFILING_TOKEN).",
+    )
+    multi_wallet_concurrency: int = Field(
+        default_factory=lambda: int(os.getenv("MULTI_WALLET_CONCURRENCY", "5")),
+        ge=1,
+        description="Maximum concurrent upstream requests when merging transactions of several wallets "
+        "(override with MULTI_WALLET_CONCURRENCY).",
+    )
+    mcp_transport: McpTransport = Field(
+        default_factory=lambda: os.getenv("MCP_TRANSPORT", "http"),
+        validate_default=True,
+        description="MCP transport to serve: 'http' (streamable HTTP) or 'stdio' for local clients (override "
+        "with MCP_TRANSPORT or --transport).",
+    )
@@ -33,5 +33,9 @@ class WalletResponse(BaseModel):
     status: int | None = None
     error: str | None = None
     message: str | None = None
+    stale: bool | None = Field(
+        default=None,
+        description="True when served from the last known good response during an upstream outage",
+    )
 
     model_config = ConfigDict(extra="ignore")
@@ -0,0 +1,111 @@
+"""Persist in-memory caches across restarts.
+
+Snapshot format: `SNAPSHOT_MAGIC`, one version byte, then a zlib-compressed JSON object mapping cache
+names to `[key, expires_at, value]` entries. Expiry timestamps are wall-clock, so entries that expired
+while the server was down are dropped on load.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import zlib
+from collections.abc import AsyncIterator, Collection, Mapping
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+from typing import Any
+
+from bp_mcp.cache import CACHES, TTLCache
+
+LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"BPMCSNAP"
+SNAPSHOT_VERSION = 1
+
+
+def encode_snapshot(entries: Mapping[str, list[tuple[str, float, Any]]]) -> bytes:
+    payload = json.dumps(entries, separators=(",", ":")).encode()
+    return SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]) + zlib.compress(payload)
+
+
+def decode_snapshot(data: bytes) -> dict[str, list[tuple[str, float, Any]]]:
+    header_size = len(SNAPSHOT_MAGIC) + 1
+    if data[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or data[len(SNAPSHOT_MAGIC)] != SNAPSHOT_VERSION:
+        raise ValueError("Not a cache snapshot or unsupported snapshot version")
+    payload = json.loads(zlib.decompress(data[header_size:]))
+    return {name: [tuple(entry) for entry in entries] for name, entries in payload.items()}
+
+
+def write_snapshot(path: Path, entries: Mapping[str, list[tuple[str, float, Any]]]) -> None:
+    """Atomically write a snapshot file readable by the current user only."""
+    data = encode_snapshot(entries)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per process, as worker processes may snapshot to the same path concurrently
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    tmp_path.replace(path)
+
+
+def read_snapshot(path: Path) -> dict[str, list[tuple[str, float, Any]]]:
+    """Read a snapshot file, ignoring missing or unreadable ones."""
+    try:
+        return decode_snapshot(path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (ValueError, zlib.error, IndexError):
+        LOGGER.warning("Ignoring unreadable cache snapshot %s", path, exc_info=True)
+        return {}
+
+
+async def load_snapshot(path: Path, caches: Mapping[str, TTLCache[Any]]) -> int:
+    """Restore unexpired entries of `caches` from a snapshot file. Return the number restored."""
+    snapshot = await asyncio.to_thread(read_snapshot, path)
+    return sum(cache.load(snapshot.get(name, [])) for name, cache in caches.items())
+
+
+async def save_snapshot(path: Path, caches: Mapping[str, TTLCache[Any]]) -> None:
+    # Copy the entries on the event loop, encode and write them in a worker thread
+    entries = {name: cache.dump() for name, cache in caches.items()}
+    await asyncio.to_thread(write_snapshot, path, entries)
+
+
+async def _snapshot_periodically(path: Path, interval_s: float, caches: Mapping[str, TTLCache[Any]]) -> None:
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await save_snapshot(path, caches)
+        except OSError:
+            LOGGER.exception("Failed to write cache snapshot %s", path)
+
+
+@asynccontextmanager
+async def cache_snapshots(
+    path: Path | None, interval_s: float, names: Collection[str]
+) -> AsyncIterator[None]:
+    """Restore caches in `names` from `path` on enter, snapshot them every `interval_s` and on exit.
+
+    Caches not in `names` are neither restored nor written.
+    """
+    if path is None:
+        yield
+        return
+
+    unknown = set(names) - CACHES.keys()
+    if unknown:
+        LOGGER.warning("Not snapshotting unknown caches: %s", ", ".join(sorted(unknown)))
+    caches = {name: cache for name, cache in CACHES.items() if name in names}
+    restored = await load_snapshot(path, caches)
+    LOGGER.info("Restored %d entries of caches %s from %s", restored, ", ".join(caches), path)
+    task = asyncio.create_task(_snapshot_periodically(path, interval_s, caches))
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        try:
+            await save_snapshot(path, caches)
+        except OSError:
+            LOGGER.exception("Failed to write cache snapshot %s", path)
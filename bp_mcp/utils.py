@@ -1,37 +1,175 @@
+import asyncio
+import hashlib
+import math
+import weakref
 from typing import Any
+from urllib.parse import urlencode
 
 import httpx
 from fastapi import HTTPException
 
 from bp_mcp.auth import APIKey
+from bp_mcp.cache import TTLCache, get_cache
+from bp_mcp.circuit_breaker import endpoint_family, get_circuit_breaker
+from bp_mcp.compression import ACCEPT_ENCODING
+from bp_mcp.profiling import profile_phase
 from bp_mcp.schemas import Settings
 
 HTTP_ERROR_THRESHOLD = 400
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR_THRESHOLD = 500
+
+# Connection pools are bound to the event loop they were created on, so there is one client per loop
+_HTTP_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Return the upstream client shared by all requests on the running event loop.
+
+    Reusing it keeps upstream connections alive and avoids building a new TLS context per request,
+    which costs tens of milliseconds of CPU.
+    """
+    loop = asyncio.get_running_loop()
+    client = _HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(base_url=settings.bitpanda_base_url, timeout=settings.request_timeout_s)
+        _HTTP_CLIENTS[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the upstream client of the running event loop, if any."""
+    client = _HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_stale_cache(settings: Settings) -> TTLCache[Any]:
+    """Return the cache of last known good upstream responses."""
+    return get_cache("stale_responses", settings.stale_cache_max_entries, settings.stale_cache_ttl_s)
+
+
+def get_asset_response_cache(settings: Settings) -> TTLCache[Any]:
+    """Return the read-through cache of upstream asset responses, which rarely change."""
+    return get_cache(
+        "asset_responses", settings.asset_response_cache_max_entries, settings.asset_response_cache_ttl_s
+    )
+
+
+def _request_key(path: str, params: dict | None) -> str:
+    return f"{path}?{urlencode(sorted((params or {}).items()), doseq=True)}"
+
+
+def _user_key(path: str, api_key: APIKey, params: dict | None) -> str:
+    # Responses are per user, but the raw API key must never be kept around
+    key_hash = hashlib.sha256(api_key.key.encode()).hexdigest()[:16]
+    return f"{key_hash}:{_request_key(path, params)}"
+
+
+def _error_detail(resp: httpx.Response) -> str:
+    try:
+        error_data = resp.json()
+        # Try to extract error message from different formats
+        if "message" in error_data:
+            return str(error_data["message"])
+        if error_data.get("errors"):
+            return str(error_data["errors"][0].get("title", resp.text))
+    except Exception:  # noqa: S110
+        pass
+    return resp.text
+
+
+def _stale_or_raise(stale_cache: TTLCache[Any], cache_key: str, exc: HTTPException) -> Any:
+    stale = stale_cache.get(cache_key)
+    if stale is None:
+        raise exc
+    return {**stale, "stale": True}
 
 
 # Utility to perform GET with X-Api-Key header
-async def bp_get(settings: Settings, path: str, api_key: APIKey, params: dict | None = None) -> Any:
-    """Perform GET request to Bitpanda API with authentication."""
-    http_client = httpx.AsyncClient(base_url=settings.bitpanda_base_url, timeout=settings.request_timeout_s)
-    headers = {"X-Api-Key": api_key.key}
+async def bp_get(
+    settings: Settings,
+    path: str,
+    api_key: APIKey,
+    params: dict | None = None,
+    cache: TTLCache[Any] | None = None,
+) -> Any:
+    """Perform GET request to Bitpanda API with authentication.
+
+    Calls are guarded by a circuit breaker per endpoint family. While upstream is failing, the last
+    known good response for the same request is returned with `stale: true` when available.
+    A `cache` is for public responses, the same for every user: successful responses are kept in it by
+    path and query only, and served from it without calling upstream.
+    """
+    family = endpoint_family(path)
+    breaker = get_circuit_breaker(settings, family)
+    stale_cache = get_stale_cache(settings)
+    cache_key = _user_key(path, api_key, params)
+    shared_key = _request_key(path, params)
+    if cache is not None and (cached := cache.get(shared_key)) is not None:
+        return cached
+
+    if not breaker.allow_request():
+        return _stale_or_raise(
+            stale_cache,
+            cache_key,
+            HTTPException(
+                status_code=503,
+                detail=f"Bitpanda upstream '{family}' is unavailable (circuit breaker open).",
+                headers={"Retry-After": str(math.ceil(breaker.retry_after()))},
+            ),
+        )
+
+    http_client = get_http_client(settings)
+    # Ask for every encoding httpx can decode, upstream pages compress very well
+    headers = {"X-Api-Key": api_key.key, "Accept-Encoding": ACCEPT_ENCODING}
     try:
-        async with http_client:
+        with profile_phase("upstream"):
             resp = await http_client.get(path, headers=headers, params=params)
-    except httpx.HTTPError as err:  # pragma: no cover
+    except httpx.HTTPError as err:
         # network/timeout
-        raise HTTPException(status_code=502, detail=f"Upstream error contacting Bitpanda: {err}") from err
-
-    if resp.status_code >= HTTP_ERROR_THRESHOLD:  # pragma: no cover
-        try:
-            error_data = resp.json()
-            # Try to extract error message from different formats
-            if "message" in error_data:
-                detail = error_data["message"]
-            elif error_data.get("errors"):
-                detail = error_data["errors"][0].get("title", resp.text)
-            else:
-                detail = resp.text
-        except Exception:
-            detail = resp.text
-        raise HTTPException(status_code=resp.status_code, detail=detail)
-    return resp.json()
+        breaker.record_failure()
+        return _stale_or_raise(
+            stale_cache,
+            cache_key,
+            HTTPException(status_code=502, detail=f"Upstream error contacting Bitpanda: {err}"),
+        )
+    except BaseException:
+        # Cancelled (e.g. client went away) or unexpected: no outcome, but don't leak a half-open trial slot
+        breaker.release_trial()
+        raise
+
+    if resp.status_code == HTTP_TOO_MANY_REQUESTS:
+        # Rate limits are per API key, they must not open the breaker shared by all users
+        breaker.release_trial()
+        retry_after = resp.headers.get("Retry-After")
+        return _stale_or_raise(
+            stale_cache,
+            cache_key,
+            HTTPException(
+                status_code=resp.status_code,
+                detail=_error_detail(resp),
+                headers={"Retry-After": retry_after} if retry_after else None,
+            ),
+        )
+
+    if resp.status_code >= HTTP_SERVER_ERROR_THRESHOLD:
+        breaker.record_failure()
+        return _stale_or_raise(
+            stale_cache, cache_key, HTTPException(status_code=resp.status_code, detail=_error_detail(resp))
+        )
+
+    # Client errors (e.g. 401, 404) mean upstream is healthy
+    breaker.record_success()
+    if resp.status_code >= HTTP_ERROR_THRESHOLD:
+        raise HTTPException(status_code=resp.status_code, detail=_error_detail(resp))
+
+    with profile_phase("parse_validate"):
+        data = resp.json()
+    if isinstance(data, dict):
+        stale_cache.set(cache_key, data)
+        if cache is not None:
+            cache.set(shared_key, data)
+    return data
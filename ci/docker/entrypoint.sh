@@ -5,4 +5,8 @@ if [ "$1" = 'api' ] ; then
     exec python -m bp_mcp.bitpanda_mcp_server
 fi
 
+if [ "$1" = 'stdio' ] ; then
+    exec python -m bp_mcp.bitpanda_mcp_server --transport stdio
+fi
+
 exec "$@"
@@ -5,7 +5,19 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from bp_mcp.asset_index import ASSET_INDEX
 from bp_mcp.bitpanda_mcp_server import app
+from bp_mcp.cache import CACHES
+from bp_mcp.circuit_breaker import BREAKERS
+
+
+@pytest.fixture(autouse=True)
+def _reset_upstream_state() -> Iterator[None]:
+    """Isolate tests from circuit breakers and caches filled by previous tests."""
+    yield
+    BREAKERS.clear()
+    CACHES.clear()
+    ASSET_INDEX.clear()
 
 
 @pytest.fixture
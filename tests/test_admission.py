@@ -0,0 +1,160 @@
+"""Tests for admission control and load shedding."""
+
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.types import Receive, Scope, Send
+
+from bp_mcp.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    OverloadedError,
+    is_priority_tool_call,
+)
+from bp_mcp.bitpanda_mcp_server import admission, create_http_app
+
+
+def test_rejects_when_queue_is_full() -> None:
+    async def scenario() -> None:
+        controller = AdmissionController(
+            max_in_flight=1, max_queued=0, queue_timeout_s=1
+        )
+        await controller.acquire()
+        with pytest.raises(OverloadedError):
+            await controller.acquire()
+        controller.release()
+        await controller.acquire()
+
+    asyncio.run(scenario())
+
+
+def test_rejects_after_queue_timeout() -> None:
+    async def scenario() -> None:
+        controller = AdmissionController(
+            max_in_flight=1, max_queued=1, queue_timeout_s=0.01
+        )
+        await controller.acquire()
+        with pytest.raises(OverloadedError):
+            await controller.acquire()
+        assert controller.queued == 0
+        assert controller.rejected_total == 1
+
+    asyncio.run(scenario())
+
+
+def test_release_between_cancel_and_resume_of_waiter() -> None:
+    async def scenario() -> None:
+        controller = AdmissionController(
+            max_in_flight=1, max_queued=1, queue_timeout_s=1
+        )
+        await controller.acquire()
+        waiting = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+
+        # The waiter future is cancelled at once, the task only resumes on the next loop iteration
+        waiting.cancel()
+        controller.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert controller.queued == 0
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_priority_requests_are_admitted_first() -> None:
+    async def scenario() -> list[str]:
+        controller = AdmissionController(
+            max_in_flight=1, max_queued=2, queue_timeout_s=1
+        )
+        admitted: list[str] = []
+
+        async def request(name: str, priority: bool) -> None:
+            await controller.acquire(priority=priority)
+            admitted.append(name)
+            controller.release()
+
+        await controller.acquire()
+        tasks = [
+            asyncio.create_task(request("normal", priority=False)),
+            asyncio.create_task(request("priority", priority=True)),
+        ]
+        await asyncio.sleep(0)
+        assert controller.queued == 2  # noqa: PLR2004
+        controller.release()
+        await asyncio.gather(*tasks)
+        assert controller.in_flight == 0
+        return admitted
+
+    assert asyncio.run(scenario()) == ["priority", "normal"]
+
+
+def test_priority_is_read_from_tool_calls() -> None:
+    def call(name: str) -> bytes:
+        body = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": name},
+        }
+        return json.dumps(body).encode()
+
+    assert is_priority_tool_call(call("find_assets"))
+    assert not is_priority_tool_call(call("get_transactions"))
+    assert not is_priority_tool_call(b'{"jsonrpc": "2.0", "method": "tools/list"}')
+    assert not is_priority_tool_call(b"[not json")
+
+
+def test_overloaded_mcp_request_gets_fast_503(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(admission, "in_flight", admission.max_in_flight)
+    monkeypatch.setattr(admission, "max_queued", 0)
+    tool_call = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "find_assets", "arguments": {"query": "btc"}},
+    }
+
+    with TestClient(create_http_app()) as client:
+        response = client.post(
+            "/mcp",
+            json=tool_call,
+            headers={"Accept": "application/json, text/event-stream"},
+        )
+        # Health probes reach the HTTP app and are never shed
+        health = client.get("/healthz")
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+    data = response.json()
+    assert data["status"] == HTTPStatus.SERVICE_UNAVAILABLE
+    assert data["error"] == "Service Unavailable"
+    assert "overloaded" in data["message"]
+
+    assert health.status_code == HTTPStatus.OK
+    assert health.json()["admission"]["rejected_total"] >= 1
+
+
+def test_admitted_request_body_is_replayed() -> None:
+    received: list[bytes] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            received.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    controller = AdmissionController(max_in_flight=1, max_queued=0, queue_timeout_s=1)
+    client = TestClient(AdmissionMiddleware(app, controller, retry_after_s=1))
+    body = b"x" * 10_000  # more than is inspected for priority
+
+    assert client.post("/mcp", content=body).status_code == HTTPStatus.OK
+    assert b"".join(received) == body
+    assert controller.in_flight == 0
@@ -0,0 +1,123 @@
+"""Tests for the asset symbol/name lookup index."""
+
+import difflib
+import json
+from http import HTTPStatus
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from bp_mcp.asset_index import (
+    MAX_FUZZY_CANDIDATES,
+    MAX_PREFIX_TERMS,
+    AssetIndex,
+    read_asset_seed_file,
+)
+from bp_mcp.schemas import AssetData
+
+BTC = AssetData(id="ea8962d5-edee-11eb-9bf0-06502b1fe55d", name="Bitcoin", symbol="BTC")
+BCH = AssetData(
+    id="ea8a4b2f-edee-11eb-9bf0-06502b1fe55d", name="Bitcoin Cash", symbol="BCH"
+)
+ETH = AssetData(
+    id="ea8a0a0e-edee-11eb-9bf0-06502b1fe55d", name="Ethereum", symbol="ETH"
+)
+
+
+def make_index() -> AssetIndex:
+    index = AssetIndex()
+    index.add_many([BTC, BCH, ETH])
+    return index
+
+
+def test_search_by_symbol_and_name() -> None:
+    index = make_index()
+
+    assert index.search("btc") == [BTC]
+    assert index.search("Ethereum") == [ETH]
+    # Exact name match first, then prefix matches
+    assert index.search("bitcoin") == [BTC, BCH]
+    assert index.search("cash") == [BCH]
+    assert index.search("eth ") == [ETH]
+
+
+def test_search_prefix_and_fuzzy() -> None:
+    index = make_index()
+
+    assert index.search("eth", limit=1) == [ETH]
+    assert index.search("bitc", limit=1) == [BTC]
+    assert index.search("etherium") == [ETH]
+    assert index.search("dogecoin") == []
+    assert index.search("  ") == []
+
+
+def test_fuzzy_matching_is_bounded() -> None:
+    index = make_index()
+    index.add_many(
+        AssetData(id=f"filler-{i}", name=f"Ethan Token {i}", symbol=f"E{i}")
+        for i in range(5000)
+    )
+
+    with patch(
+        "bp_mcp.asset_index.difflib.get_close_matches",
+        wraps=difflib.get_close_matches,
+    ) as fuzzy:
+        assert index.search("ETH")[0] == ETH
+        assert index.search("ethereum") == [ETH]
+        fuzzy.assert_not_called()  # exact and prefix hits skip fuzzy matching
+
+        assert index.search("etherium") == [ETH]
+        fuzzy.assert_called_once()
+        assert len(fuzzy.call_args.args[1]) <= MAX_FUZZY_CANDIDATES
+
+
+def test_prefix_matching_is_bounded() -> None:
+    index = make_index()
+    index.add_many(
+        AssetData(id=f"filler-{i}", name=f"Token {i}", symbol=f"B{i}")
+        for i in range(5000)
+    )
+
+    prefixed = list(index._prefixed_terms("b"))  # noqa: SLF001
+
+    assert len(prefixed) == MAX_PREFIX_TERMS
+    assert all(term.startswith("b") for term in prefixed)
+    assert index.search("b")
+
+
+def test_renamed_asset_replaces_old_terms() -> None:
+    index = make_index()
+
+    index.add(AssetData(id=ETH.id, name="Gas Token", symbol="ETH"))
+
+    assert len(index) == 3  # noqa: PLR2004
+    assert index.search("ethereum") == []
+    assert index.search("gas")[0].name == "Gas Token"
+
+
+def test_read_asset_seed_file(tmp_path: Path) -> None:
+    path = tmp_path / "assets.json"
+    path.write_text(json.dumps({"data": [BTC.model_dump(), ETH.model_dump()]}))
+    assert read_asset_seed_file(path) == [BTC, ETH]
+
+    path.write_text(json.dumps([{"id": "missing-fields"}]))
+    assert read_asset_seed_file(path) == []
+
+
+@patch("bp_mcp.bitpanda_mcp_server.bp_get", new_callable=AsyncMock)
+def test_find_assets_uses_assets_seen(
+    mock_bp_get: AsyncMock, client: TestClient
+) -> None:
+    headers = {"X-Api-Key": "test"}
+    response = client.get("/v1/assets", params={"query": "BTC"}, headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"data": []}
+
+    mock_bp_get.return_value = {"data": BTC.model_dump()}
+    client.get(f"/v1/assets/{BTC.id}", headers=headers)
+
+    response = client.get("/v1/assets", params={"query": "BTC"}, headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"data": [BTC.model_dump()]}
+    assert mock_bp_get.call_count == 1
@@ -0,0 +1,194 @@
+"""Tests for upstream circuit breaking and stale responses."""
+
+import asyncio
+from http import HTTPStatus
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from bp_mcp.auth import APIKey
+from bp_mcp.bitpanda_mcp_server import settings
+from bp_mcp.circuit_breaker import BREAKERS, CircuitBreaker, endpoint_family
+from bp_mcp.utils import bp_get
+
+ASSET_ID = "ea8962d5-edee-11eb-9bf0-06502b1fe55d"
+ASSET_PAYLOAD = {"data": {"id": ASSET_ID, "name": "Bitcoin", "symbol": "BTC"}}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        name="assets",
+        failure_rate=0.5,
+        window=4,
+        min_calls=4,
+        open_s=10,
+        half_open_calls=1,
+        clock=clock,
+    )
+
+
+def upstream_response(status_code: int, payload: dict) -> httpx.Response:
+    return httpx.Response(
+        status_code, json=payload, request=httpx.Request("GET", "https://upstream")
+    )
+
+
+def test_endpoint_family() -> None:
+    assert endpoint_family(f"/v1/assets/{ASSET_ID}") == "assets"
+    assert endpoint_family("/v1/transactions") == "transactions"
+    assert endpoint_family("/v1/wallets/") == "wallets"
+
+
+def test_breaker_opens_on_failure_rate() -> None:
+    breaker = make_breaker(FakeClock())
+
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.snapshot().state == "closed"  # not enough calls yet
+
+    breaker.record_failure()
+    assert breaker.snapshot().state == "open"
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_open_trial() -> None:
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.retry_after() == 10  # noqa: PLR2004
+
+    clock.now = 10
+    assert breaker.snapshot().state == "half_open"
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one trial call at a time
+
+    breaker.record_failure()
+    assert breaker.snapshot().state == "open"
+
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.snapshot().state == "closed"
+    assert breaker.allow_request()
+
+
+def test_cancelled_trial_releases_half_open_slot() -> None:
+    clock = FakeClock()
+    breaker = BREAKERS["assets"] = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10
+
+    async def cancel_trial() -> None:
+        upstream_called = asyncio.Event()
+
+        async def hang(*_: object, **__: object) -> httpx.Response:
+            upstream_called.set()
+            await asyncio.Event().wait()
+            raise AssertionError("unreachable")
+
+        with patch("httpx.AsyncClient.get", new=hang):
+            task = asyncio.create_task(
+                bp_get(settings, f"/v1/assets/{ASSET_ID}", APIKey(key="test"))
+            )
+            await upstream_called.wait()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(cancel_trial())
+
+    assert breaker.snapshot().state == "half_open"
+    assert breaker.allow_request()  # the trial slot is free again
+
+
+def test_open_breaker_serves_stale_response(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Always call upstream, instead of answering from the asset response cache
+    monkeypatch.setattr(settings, "asset_response_cache_ttl_s", 0)
+    headers = {"X-Api-Key": "test"}
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = upstream_response(HTTPStatus.OK, ASSET_PAYLOAD)
+        response = client.get(f"/v1/assets/{ASSET_ID}", headers=headers)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["stale"] is None
+
+        mock_get.return_value = upstream_response(
+            HTTPStatus.SERVICE_UNAVAILABLE, {"message": "down"}
+        )
+        for _ in range(5):
+            response = client.get(f"/v1/assets/{ASSET_ID}", headers=headers)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()["stale"] is True
+
+        calls = mock_get.call_count
+        response = client.get(f"/v1/assets/{ASSET_ID}", headers=headers)
+        assert response.json() == {**ASSET_PAYLOAD, "stale": True}
+        assert mock_get.call_count == calls  # open breaker does not call upstream
+
+    health = client.get("/healthz").json()
+    assert health["status"] == "DEGRADED"
+    assert health["upstream"]["assets"]["state"] == "open"
+
+
+def test_open_breaker_fails_fast_without_stale_response(client: TestClient) -> None:
+    headers = {"X-Api-Key": "test"}
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = httpx.ConnectError("connection refused")
+        for _ in range(5):
+            response = client.get("/v1/transactions", headers=headers)
+            assert response.status_code == HTTPStatus.BAD_GATEWAY
+
+        response = client.get("/v1/transactions", headers=headers)
+        assert mock_get.call_count == 5  # noqa: PLR2004
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert int(response.headers["Retry-After"]) > 0
+    data = response.json()
+    assert data["status"] == HTTPStatus.SERVICE_UNAVAILABLE
+    assert "circuit breaker open" in data["message"]
+
+
+def test_client_errors_do_not_open_breaker(client: TestClient) -> None:
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = upstream_response(
+            HTTPStatus.NOT_FOUND, {"message": "not found"}
+        )
+        for _ in range(10):
+            response = client.get(
+                f"/v1/assets/{ASSET_ID}", headers={"X-Api-Key": "test"}
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND
+
+    assert client.get("/healthz").json()["upstream"]["assets"]["state"] == "closed"
+
+
+def test_rate_limits_do_not_open_shared_breaker(client: TestClient) -> None:
+    limited = httpx.Response(
+        HTTPStatus.TOO_MANY_REQUESTS,
+        json={"message": "slow down"},
+        headers={"Retry-After": "7"},
+        request=httpx.Request("GET", "https://upstream"),
+    )
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = limited
+        for _ in range(10):
+            response = client.get("/v1/transactions", headers={"X-Api-Key": "noisy"})
+            assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+            assert response.headers["Retry-After"] == "7"
+
+    assert (
+        client.get("/healthz").json()["upstream"]["transactions"]["state"] == "closed"
+    )
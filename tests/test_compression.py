@@ -0,0 +1,143 @@
+"""Tests for response compression."""
+
+import asyncio
+import gzip
+import json
+from http import HTTPStatus
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.types import Message, Receive, Scope, Send
+
+from bp_mcp.bitpanda_mcp_server import create_http_app
+from bp_mcp.compression import CompressionMiddleware, negotiate_encoding
+
+TRANSACTION = {
+    "transaction_id": "f5ab5a1e-3c6a-4f1c-9a51-3c7d3b7a2f10",
+    "operation_id": "0b4a8c3e-2f7e-4b8e-bf1a-1e4b2d6c9a11",
+    "asset_id": "ea8962d5-edee-11eb-9bf0-06502b1fe55d",
+    "account_id": "7c0f3d2e-5a1b-4c9d-8e7f-6a5b4c3d2e1f",
+    "wallet_id": "3e2d1c0b-9a8f-4e7d-b6c5-a4b3c2d1e0f9",
+    "asset_amount": 0.0125,
+    "fee_amount": 0.0001,
+    "operation_type": "buy",
+    "flow": "INCOMING",
+    "credited_at": "2024-01-01T12:00:00Z",
+}
+
+
+@pytest.fixture
+def compressed_client(application: FastAPI) -> TestClient:
+    return TestClient(CompressionMiddleware(application, minimum_size=1024, level=6))
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("*", "gzip"),
+        ("gzip;q=0", None),
+        ("deflate", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding: str, expected: str | None) -> None:
+    with patch.dict("bp_mcp.compression.ENCODERS", {"gzip": gzip.compress}, clear=True):
+        assert negotiate_encoding(accept_encoding) == expected
+
+
+@patch("bp_mcp.bitpanda_mcp_server.bp_get", new_callable=AsyncMock)
+def test_large_page_is_compressed(
+    mock_bp_get: AsyncMock, compressed_client: TestClient
+) -> None:
+    mock_bp_get.return_value = {"data": [TRANSACTION] * 100, "page_size": 100}
+
+    response = compressed_client.get(
+        "/v1/transactions", headers={"X-Api-Key": "test", "Accept-Encoding": "gzip"}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) < len(json.dumps(response.json()))
+    assert len(response.json()["data"]) == 100  # noqa: PLR2004
+
+
+def test_small_response_is_not_compressed(compressed_client: TestClient) -> None:
+    response = compressed_client.get("/healthz", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == HTTPStatus.OK
+    assert "Content-Encoding" not in response.headers
+    assert response.json()["status"] == "OK"
+
+
+def test_mcp_responses_are_compressed() -> None:
+    headers = {
+        "Accept": "application/json, text/event-stream",
+        "Accept-Encoding": "gzip",
+        "X-Api-Key": "test",
+    }
+    initialize = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "test", "version": "1.0"},
+        },
+    }
+
+    with TestClient(create_http_app()) as client:
+        response = client.post("/mcp", json=initialize, headers=headers)
+        headers["Mcp-Session-Id"] = response.headers["Mcp-Session-Id"]
+        client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+            headers=headers,
+        )
+        response = client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+            headers=headers,
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    tools = {tool["name"] for tool in response.json()["result"]["tools"]}
+    assert {"get_asset", "get_transactions", "get_wallets"} <= tools
+
+
+def test_event_stream_headers_are_not_held_back() -> None:
+    first_event = asyncio.Event()
+
+    async def idle_stream(scope: Scope, receive: Receive, send: Send) -> None:
+        headers = [(b"content-type", b"text/event-stream")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await first_event.wait()
+        await send({"type": "http.response.body", "body": b"data: {}\n\n"})
+
+    async def scenario() -> list[Message]:
+        sent: list[Message] = []
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": b""}
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        app = CompressionMiddleware(idle_stream, minimum_size=0)
+        task = asyncio.create_task(app(scope, receive, send))
+        await asyncio.sleep(0)
+        started = list(sent)
+        first_event.set()
+        await task
+        return started
+
+    assert [message["type"] for message in asyncio.run(scenario())] == [
+        "http.response.start"
+    ]
@@ -0,0 +1,210 @@
+"""Tests for merged multi-wallet transactions."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from bp_mcp.multi_wallet import (
+    decode_cursor,
+    encode_cursor,
+    merge_wallet_transactions,
+)
+from bp_mcp.schemas import TransactionResponse
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make_transaction(wallet_id: str, minutes: int) -> dict:
+    return {
+        "transaction_id": f"{wallet_id}-{minutes}",
+        "operation_id": f"op-{wallet_id}-{minutes}",
+        "asset_id": "ea8962d5-edee-11eb-9bf0-06502b1fe55d",
+        "account_id": "account",
+        "wallet_id": wallet_id,
+        "asset_amount": 1.0,
+        "fee_amount": 0.0,
+        "operation_type": "buy",
+        "flow": "INCOMING",
+        "credited_at": (START - timedelta(minutes=minutes)).isoformat(),
+    }
+
+
+class FakeUpstream:
+    """Serves each wallet's transactions newest first, paged with the index as cursor."""
+
+    def __init__(self, minutes_by_wallet: dict[str, list[int]]) -> None:
+        self.transactions = {
+            wallet_id: [make_transaction(wallet_id, m) for m in sorted(minutes)]
+            for wallet_id, minutes in minutes_by_wallet.items()
+        }
+        self.calls: list[tuple[str, str | None]] = []
+        self.stale_wallets: set[str] = set()
+
+    async def fetch_page(
+        self, wallet_id: str, cursor: str | None, size: int
+    ) -> TransactionResponse:
+        self.calls.append((wallet_id, cursor))
+        start = int(cursor) if cursor else 0
+        items = self.transactions[wallet_id][start : start + size]
+        has_next = start + size < len(self.transactions[wallet_id])
+        return TransactionResponse.model_validate(
+            {
+                "data": items,
+                "end_cursor": str(start + size),
+                "has_next_page": has_next,
+                "stale": True if wallet_id in self.stale_wallets else None,
+            }
+        )
+
+
+def collect_all(
+    upstream: FakeUpstream, wallet_ids: list[str], page_size: int
+) -> list[list[str]]:
+    pages = []
+    after = None
+    while True:
+        page = asyncio.run(
+            merge_wallet_transactions(wallet_ids, upstream.fetch_page, page_size, after)
+        )
+        pages.append([t.transaction_id for t in page.data or []])
+        if not page.has_next_page:
+            return pages
+        after = page.end_cursor
+
+
+def test_stale_wallet_page_marks_merged_page_stale() -> None:
+    upstream = FakeUpstream({"a": [1, 3], "b": [2, 4]})
+
+    fresh = asyncio.run(merge_wallet_transactions(["a", "b"], upstream.fetch_page, 4))
+    assert fresh.stale is None
+
+    upstream.stale_wallets.add("b")
+    page = asyncio.run(merge_wallet_transactions(["a", "b"], upstream.fetch_page, 4))
+    assert page.stale is True
+
+
+def test_merges_wallets_newest_first_across_pages() -> None:
+    upstream = FakeUpstream({"a": [1, 4, 5, 9], "b": [2, 3, 8], "c": [6]})
+
+    pages = collect_all(upstream, ["a", "b", "c"], page_size=3)
+
+    assert pages == [["a-1", "b-2", "b-3"], ["a-4", "a-5", "c-6"], ["b-8", "a-9"]]
+
+
+def test_fetches_upstream_pages_lazily() -> None:
+    upstream = FakeUpstream({"a": list(range(0, 20, 2)), "b": list(range(100, 120))})
+
+    page = asyncio.run(
+        merge_wallet_transactions(["a", "b"], upstream.fetch_page, page_size=4)
+    )
+
+    # Only wallet "a" contributes to the first page, so "b" needs no page beyond its first
+    assert [t.wallet_id for t in page.data or []] == ["a"] * 4
+    assert sorted(upstream.calls) == [("a", None), ("b", None)]
+
+    next_page = asyncio.run(
+        merge_wallet_transactions(
+            ["a", "b"], upstream.fetch_page, page_size=4, after=page.end_cursor
+        )
+    )
+    assert [t.transaction_id for t in next_page.data or []] == [
+        "a-8",
+        "a-10",
+        "a-12",
+        "a-14",
+    ]
+    # The first page of "a" was fully returned, so it continues with the next upstream page directly
+    assert ("a", "4") in upstream.calls
+    assert upstream.calls.count(("a", None)) == 1
+
+
+def test_cursor_must_match_wallets() -> None:
+    upstream = FakeUpstream({"a": [1, 2], "b": [3, 4]})
+    page = asyncio.run(
+        merge_wallet_transactions(["a", "b"], upstream.fetch_page, page_size=1)
+    )
+    assert page.end_cursor is not None
+
+    with pytest.raises(HTTPException, match="does not match"):
+        decode_cursor(page.end_cursor, ["a"])
+    with pytest.raises(HTTPException, match="Invalid cursor"):
+        decode_cursor("not-a-cursor", ["a", "b"])
+
+
+@pytest.mark.parametrize(
+    "position", [[None, -2], [5, 0], [None, "1"], [None, True], [None], "x"]
+)
+def test_cursor_rejects_invalid_positions(position: object) -> None:
+    cursor = encode_cursor(10, {"a": position})  # type: ignore[dict-item]
+
+    with pytest.raises(HTTPException, match="Invalid cursor") as err:
+        decode_cursor(cursor, ["a"])
+    assert err.value.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_failed_fetch_cancels_the_other_wallets() -> None:
+    cancelled = []
+
+    async def fetch_page(
+        wallet_id: str, cursor: str | None, size: int
+    ) -> TransactionResponse:
+        if wallet_id == "failing":
+            raise HTTPException(status_code=502, detail="Upstream error")
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(wallet_id)
+            raise
+        return TransactionResponse()
+
+    async def scenario() -> None:
+        with pytest.raises(HTTPException, match="Upstream error"):
+            await merge_wallet_transactions(
+                ["slow", "failing", "slower"], fetch_page, 10
+            )
+        # Before the error is raised, not when the event loop is closed
+        assert sorted(cancelled) == ["slow", "slower"]
+
+    asyncio.run(scenario())
+
+
+@patch("bp_mcp.bitpanda_mcp_server.bp_get", new_callable=AsyncMock)
+def test_get_wallets_transactions_endpoint(
+    mock_bp_get: AsyncMock, client: TestClient
+) -> None:
+    upstream = FakeUpstream({"a": [1, 3], "b": [2]})
+
+    async def bp_get(*args: object) -> dict:
+        params = args[3]
+        assert isinstance(params, dict)
+        assert params["flow"] == "INCOMING"
+        page = await upstream.fetch_page(
+            params["wallet_id"], params.get("after"), params["page_size"]
+        )
+        return page.model_dump(mode="json")
+
+    mock_bp_get.side_effect = bp_get
+
+    response = client.get(
+        "/v1/transactions/merged",
+        params={"wallet_id": ["a", "b", "a"], "flow": "INCOMING", "page_size": 10},
+        headers={"X-Api-Key": "test"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert [t["transaction_id"] for t in data["data"]] == ["a-1", "b-2", "a-3"]
+    assert data["has_next_page"] is False
+    assert mock_bp_get.call_count == 2  # noqa: PLR2004
+
+    response = client.get(
+        "/v1/transactions/merged",
+        params={"wallet_id": "a", "after": "bogus"},
+        headers={"X-Api-Key": "test"},
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
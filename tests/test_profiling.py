@@ -0,0 +1,145 @@
+"""Tests for per-request profiling."""
+
+import asyncio
+import json
+from http import HTTPStatus
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.types import Message, Receive, Scope, Send
+
+from bp_mcp.bitpanda_mcp_server import create_http_app, settings
+from bp_mcp.profiling import PROFILE_REPORTS, ProfilingMiddleware
+from bp_mcp.schemas import ProfileReport
+
+TOKEN = "profiling-secret"  # noqa: S105
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "profiling_token", TOKEN)
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+@patch("bp_mcp.bitpanda_mcp_server.bp_get", new_callable=AsyncMock)
+def test_profiled_tool_call_reports_phases(
+    mock_bp_get: AsyncMock,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    mock_bp_get.return_value = {"data": [], "page_size": 25}
+    monkeypatch.setattr(settings, "server_workers", 2)  # stateless, no MCP session
+    headers = {
+        "Accept": "application/json, text/event-stream",
+        "X-Api-Key": "test",
+        "X-Profile-Token": TOKEN,
+    }
+    tool_call = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "get_transactions", "arguments": {}},
+    }
+
+    with (
+        caplog.at_level("INFO", logger="bp_mcp.profiling"),
+        TestClient(create_http_app()) as client,
+    ):
+        response = client.post("/mcp", json=tool_call, headers=headers)
+        report = client.get(
+            f"/debug/profiles/{response.headers['X-Profile-Id']}",
+            headers={"X-Profile-Token": TOKEN},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    phases = {
+        item.split(";")[0] for item in response.headers["Server-Timing"].split(", ")
+    }
+    # parse_validate is recorded by the tool call forwarded to the FastAPI app
+    assert {"parse_validate", "encode", "other", "total"} <= phases
+
+    assert report.status_code == HTTPStatus.OK
+    data = report.json()
+    assert data["path"] == "/mcp"
+    assert data["status_code"] == HTTPStatus.OK
+    assert data["phases_ms"]["total"] >= data["phases_ms"]["parse_validate"]
+    assert "cumulative" in data["cpu_profile"]
+    assert data["concurrent_requests"] == 0
+    # Logged in full, for workers that don't keep the report
+    logged = [
+        json.loads(record.getMessage().split(": ", 1)[1])
+        for record in caplog.records
+        if record.name == "bp_mcp.profiling"
+    ]
+    assert logged[0] == data
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+def test_cpu_profile_only_starts_without_other_requests() -> None:
+    started = asyncio.Event()
+    finish = asyncio.Event()
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["path"] == "/slow":
+            started.set()
+            await finish.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def request(path: str, profiled: bool) -> str | None:
+        headers = [(b"x-profile-token", TOKEN.encode())] if profiled else []
+        scope = {"type": "http", "method": "GET", "path": path, "headers": headers}
+        sent: list[Message] = []
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        await middleware(scope, AsyncMock(), send)
+        return dict(sent[0]["headers"]).get(b"x-profile-id", b"").decode() or None
+
+    async def scenario() -> tuple[ProfileReport | None, ProfileReport | None]:
+        slow = asyncio.create_task(request("/slow", profiled=True))
+        await started.wait()
+        # The slow request is in flight, so this one doesn't get a CPU profile
+        skipped = PROFILE_REPORTS.get(await request("/fast", profiled=True) or "")
+        await request("/fast", profiled=False)
+        finish.set()
+        return PROFILE_REPORTS.get(await slow or ""), skipped
+
+    middleware = ProfilingMiddleware(app, settings)
+    profiled, skipped = asyncio.run(scenario())
+
+    assert skipped is not None
+    assert skipped.cpu_profile is None
+    assert skipped.cpu_profile_note == "Not captured, 1 other requests were in flight"
+    assert profiled is not None
+    assert profiled.cpu_profile is not None
+    assert profiled.concurrent_requests == 2  # noqa: PLR2004
+    assert profiled.cpu_profile_note == "Includes the frames of 2 other requests"
+
+
+@pytest.mark.usefixtures("profiling_enabled")
+@patch("bp_mcp.bitpanda_mcp_server.bp_get", new_callable=AsyncMock)
+def test_requests_without_valid_token_are_not_profiled(
+    mock_bp_get: AsyncMock, client: TestClient
+) -> None:
+    mock_bp_get.return_value = {"data": [], "page_size": 25}
+
+    for headers in (
+        {"X-Api-Key": "test"},
+        {"X-Api-Key": "test", "X-Profile-Token": "wrong"},
+    ):
+        response = client.get("/v1/transactions", headers=headers)
+        assert response.status_code == HTTPStatus.OK
+        assert "Server-Timing" not in response.headers
+        assert "X-Profile-Id" not in response.headers
+
+
+def test_profiling_disabled_by_default() -> None:
+    with TestClient(create_http_app()) as client:
+        response = client.get("/healthz", headers={"X-Profile-Token": TOKEN})
+        report = client.get("/debug/profiles/unknown")
+
+    assert "Server-Timing" not in response.headers
+    assert report.status_code == HTTPStatus.NOT_FOUND
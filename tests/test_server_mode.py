@@ -0,0 +1,58 @@
+"""Tests for the HTTP server options and the shared upstream client."""
+
+import asyncio
+
+import pytest
+from starlette.applications import Starlette
+
+from bp_mcp.bitpanda_mcp_server import HTTP_APP_FACTORY, settings, uvicorn_options
+from bp_mcp.utils import close_http_client, get_http_client
+
+
+def test_single_worker_serves_app_in_process() -> None:
+    options = uvicorn_options(
+        settings.model_copy(update={"server_workers": 1, "server_backlog": 512})
+    )
+
+    assert isinstance(options["app"], Starlette)
+    assert "workers" not in options
+    assert options["backlog"] == 512  # noqa: PLR2004
+    assert options["loop"] == settings.server_loop
+    assert options["timeout_keep_alive"] == settings.server_keep_alive_s
+    assert options["timeout_graceful_shutdown"] == settings.server_graceful_shutdown_s
+
+
+@pytest.mark.parametrize(("workers", "expected"), [(4, 4), (0, 3)])
+def test_multiple_workers_import_app_factory(
+    monkeypatch: pytest.MonkeyPatch, workers: int, expected: int
+) -> None:
+    monkeypatch.setattr("os.cpu_count", lambda: 3)
+
+    options = uvicorn_options(settings.model_copy(update={"server_workers": workers}))
+
+    assert options["app"] == HTTP_APP_FACTORY
+    assert options["factory"] is True
+    assert options["workers"] == expected
+
+
+def test_reload_imports_app_factory() -> None:
+    options = uvicorn_options(
+        settings.model_copy(update={"server_workers": 1, "server_reload": True})
+    )
+
+    assert options["app"] == HTTP_APP_FACTORY
+    assert options["reload"] is True
+
+
+def test_upstream_client_is_shared_per_event_loop() -> None:
+    async def clients() -> None:
+        client = get_http_client(settings)
+        assert get_http_client(settings) is client
+        await close_http_client()
+        assert client.is_closed
+
+        reopened = get_http_client(settings)
+        assert reopened is not client
+        await close_http_client()
+
+    asyncio.run(clients())
@@ -0,0 +1,113 @@
+"""Tests for cache snapshots."""
+
+import asyncio
+from http import HTTPStatus
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from bp_mcp.cache import CACHES, TTLCache, get_cache
+from bp_mcp.schemas import Settings
+from bp_mcp.snapshot import (
+    cache_snapshots,
+    decode_snapshot,
+    load_snapshot,
+    read_snapshot,
+    save_snapshot,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_snapshot_roundtrip_respects_ttl(tmp_path: Path) -> None:
+    path = tmp_path / "cache.bin"
+    clock = FakeClock(1000)
+    source: TTLCache[dict] = TTLCache(max_entries=10, ttl_s=60, clock=clock)
+    source.set("old", {"data": 1})
+    clock.now = 1030
+    source.set("new", {"data": 2})
+
+    asyncio.run(save_snapshot(path, {"responses": source}))
+    assert path.stat().st_mode & 0o777 == 0o600  # noqa: PLR2004
+
+    # 40s later, "old" expired while the server was down
+    clock.now = 1070
+    restored: TTLCache[dict] = TTLCache(max_entries=10, ttl_s=60, clock=clock)
+    assert asyncio.run(load_snapshot(path, {"responses": restored})) == 1
+    assert restored.get("old") is None
+    assert restored.get("new") == {"data": 2}
+
+    clock.now = 1091
+    assert restored.get("new") is None
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "cache.bin"
+    assert read_snapshot(path) == {}
+
+    path.write_bytes(b"garbage")
+    assert read_snapshot(path) == {}
+
+    with pytest.raises(ValueError, match="Not a cache snapshot"):
+        decode_snapshot(b"garbage")
+
+
+def test_cache_snapshots_restore_on_start_and_save_on_exit(tmp_path: Path) -> None:
+    path = tmp_path / "snapshots" / "cache.bin"
+
+    async def run_server(key: str | None) -> dict | None:
+        async with cache_snapshots(path, interval_s=60, names=["responses"]):
+            cache = CACHES["responses"]
+            restored = cache.get("key")
+            if key:
+                cache.set(key, {"data": "cached"})
+            return restored
+
+    get_cache("responses", max_entries=10, ttl_s=60)
+    assert asyncio.run(run_server("key")) is None
+
+    CACHES["responses"].clear()
+    assert asyncio.run(run_server(None)) == {"data": "cached"}
+
+
+def test_asset_responses_are_cached_for_warm_restarts(client: TestClient) -> None:
+    asset_id = "ea8962d5-edee-11eb-9bf0-06502b1fe55d"
+    payload = {"data": {"id": asset_id, "name": "Bitcoin", "symbol": "BTC"}}
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = httpx.Response(
+            HTTPStatus.OK,
+            json=payload,
+            request=httpx.Request("GET", "https://upstream"),
+        )
+        # Public data, shared by all users
+        for user in ("alice", "bob"):
+            response = client.get(f"/v1/assets/{asset_id}", headers={"X-Api-Key": user})
+            assert response.json()["data"] == payload["data"]
+
+    assert mock_get.call_count == 1
+    # Registered, so the snapshot restores it
+    assert len(CACHES["asset_responses"].dump()) == 1
+
+
+def test_only_selected_caches_are_snapshotted(tmp_path: Path) -> None:
+    path = tmp_path / "cache.bin"
+    get_cache("public", max_entries=10, ttl_s=60).set("key", {"data": "public"})
+    get_cache("per_user", max_entries=10, ttl_s=60).set("key", {"data": "private"})
+
+    async def run_server() -> None:
+        async with cache_snapshots(path, interval_s=60, names=["public", "unknown"]):
+            pass
+
+    asyncio.run(run_server())
+
+    assert set(read_snapshot(path)) == {"public"}
+    assert "stale_responses" not in Settings().cache_snapshot_caches
@@ -0,0 +1,40 @@
+"""Tests for the MCP transports."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+from fastmcp import Client
+from fastmcp.client.transports import StdioTransport
+
+from bp_mcp.bitpanda_mcp_server import main
+
+
+def test_stdio_transport_uses_env_api_key() -> None:
+    transport = StdioTransport(
+        sys.executable,
+        ["-m", "bp_mcp.bitpanda_mcp_server", "--transport", "stdio"],
+        env={**os.environ, "BITPANDA_API_KEY": "stdio-key"},
+    )
+
+    async def call_tool() -> dict:
+        async with Client(transport) as client:
+            tools = {tool.name for tool in await client.list_tools()}
+            assert {
+                "get_asset",
+                "get_transactions",
+                "get_wallets",
+                "find_assets",
+            } <= tools
+            result = await client.call_tool("find_assets", {"query": "btc"})
+            assert isinstance(result.structured_content, dict)
+            return result.structured_content
+
+    # Reaching the tool means auth fell back to BITPANDA_API_KEY without any HTTP headers
+    assert asyncio.run(call_tool()) == {"data": []}
+
+
+def test_unknown_transport_is_rejected() -> None:
+    with pytest.raises(SystemExit):
+        main(["--transport", "carrier-pigeon"])